@@ -1,568 +1,382 @@
 import streamlit as st
 import numpy as np
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.units import mm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_LEFT, TA_CENTER
-import requests
 import os
 import io
+import uuid
 from datetime import datetime
 
+from peri_sb.catalog import DEFAULT_EDITION, available_editions, current_catalog, use_edition
+from peri_sb.schedule import SCHEDULE_COLUMNS, AUTO_BRACE_TYPE, read_schedule_chunks, compute_schedule, concat_schedule, schedule_to_csv, schedule_to_json
+from peri_sb.report import generate_project_report, prefetch_logo
+from peri_sb.export import discard_segment_zip, export_segment_zip
+from peri_sb.optimizer import OBJECTIVES, rank_brace_types
+from peri_sb.plots import load_surface_png
+from peri_sb.interpolators import INTERPOLATION_MODES
+from peri_sb.inverse import INVERSE_KEYS, max_height, max_pressure
+from peri_sb.pour import POUR_COLUMNS, pour_sequence, requirement_changes
+from peri_sb.cache import cached_calculation, cached_pdf_report, prerender_pdf_report, rendered_pdf_report, cache_stats
+from peri_sb.jobs import QUEUED, RUNNING, FAILED, CANCELLED, report_jobs
+from peri_sb.timing import StageTimer, add_record, stage, log_rerun
+
 # Set the page title for the browser tab
 st.set_page_config(page_title="PERI SB Frames")
 
-# Program metadata
-PROGRAM_VERSION = "1.0 - 2025"
-PROGRAM = "PERI Brace Frame Load Calculator"
-COMPANY_NAME = "tekhne Consulting Engineers"
-COMPANY_ADDRESS = "   "  # Update with actual address if needed
-LOGO_URL = "https://drive.google.com/uc?export=download&id=1VebdT2loVGX57noP9t2GgQhwCNn8AA3h"
-FALLBACK_LOGO_URL = "https://onedrive.live.com/download?cid=A48CC9068E3FACE0&resid=A48CC9068E3FACE0%21s252b6fb7fcd04f53968b2a09114d33ed"
-
-# Comprehensive brace frame data
-brace_frame_data = {
-    "SB-A+B": {
-        "heights": [3.75, 4.00, 4.25, 4.50, 4.75, 5.00, 5.25, 5.50, 5.75, 6.00],
-        "pressures": [40, 50, 60],
-        "data": {
-            3.75: {40: {"e": 2.60, "Z": 167, "V1": 71, "V2": 53, "f": 2},
-                   50: {"e": 1.95, "Z": 194, "V1": 96, "V2": 58, "f": 2},
-                   60: {"e": 1.75, "Z": 216, "V1": 100, "V2": 61, "f": 2}},
-            4.00: {40: {"e": 2.50, "Z": 181, "V1": 72, "V2": 63, "f": 3},
-                   50: {"e": 1.90, "Z": 212, "V1": 98, "V2": 63, "f": 3},
-                   60: {"e": 1.70, "Z": 238, "V1": 103, "V2": 74, "f": 4}},
-            4.25: {40: {"e": 2.40, "Z": 195, "V1": 72, "V2": 73, "f": 4},
-                   50: {"e": 1.85, "Z": 229, "V1": 98, "V2": 83, "f": 4},
-                   60: {"e": 1.65, "Z": 259, "V1": 104, "V2": 88, "f": 5}},
-            4.50: {40: {"e": 2.30, "Z": 209, "V1": 72, "V2": 85, "f": 4},
-                   50: {"e": 1.80, "Z": 249, "V1": 98, "V2": 98, "f": 5},
-                   60: {"e": 1.60, "Z": 280, "V1": 105, "V2": 103, "f": 6}},
-            4.75: {40: {"e": 2.20, "Z": 223, "V1": 72, "V2": 98, "f": 5},
-                   50: {"e": 1.75, "Z": 265, "V1": 98, "V2": 108, "f": 6},
-                   60: {"e": 1.55, "Z": 301, "V1": 105, "V2": 120, "f": 7}},
-            5.00: {40: {"e": 2.10, "Z": 238, "V1": 72, "V2": 111, "f": 5},
-                   50: {"e": 1.70, "Z": 283, "V1": 98, "V2": 126, "f": 7},
-                   60: {"e": 1.50, "Z": 322, "V1": 105, "V2": 138, "f": 8}},
-            5.25: {40: {"e": 2.00, "Z": 252, "V1": 72, "V2": 125, "f": 7},
-                   50: {"e": 1.65, "Z": 301, "V1": 98, "V2": 133, "f": 8},
-                   60: {"e": 1.45, "Z": 344, "V1": 105, "V2": 157, "f": 9}},
-            5.50: {40: {"e": 1.90, "Z": 266, "V1": 72, "V2": 140, "f": 7},
-                   50: {"e": 1.59, "Z": 318, "V1": 98, "V2": 161, "f": 9},
-                   60: {"e": 1.39, "Z": 365, "V1": 105, "V2": 178, "f": 9}},
-            5.75: {40: {"e": 1.71, "Z": 280, "V1": 72, "V2": 156, "f": 9},
-                   50: {"e": 1.49, "Z": 336, "V1": 98, "V2": 180, "f": 10},
-                   60: {"e": 1.31, "Z": 386, "V1": 105, "V2": 198, "f": 11}},
-            6.00: {40: {"e": 1.54, "Z": 294, "V1": 72, "V2": 173, "f": 10},
-                   50: {"e": 1.39, "Z": 354, "V1": 98, "V2": 200, "f": 11},
-                   60: {"e": 1.20, "Z": 407, "V1": 105, "V2": 223, "f": 12}}
-        }
-    },
-    "SB-A0+A+B+C": {
-        "heights": [6.75, 7.00, 7.25, 7.50, 7.75, 8.00, 8.25, 8.50, 8.75],
-        "pressures": [30, 40, 50, 60],
-        "data": {
-            6.75: {30: {"e": 1.91, "Z": 261, "V1": 69, "V2": 135, "f": 10},
-                   40: {"e": 1.48, "Z": 337, "V1": 92, "V2": 167, "f": 13},
-                   50: {"e": 1.22, "Z": 407, "V1": 114, "V2": 197, "f": 15},
-                   60: {"e": 1.06, "Z": 471, "V1": 136, "V2": 221, "f": 17}},
-            7.00: {30: {"e": 1.83, "Z": 272, "V1": 69, "V2": 147, "f": 12},
-                   40: {"e": 1.42, "Z": 351, "V1": 92, "V2": 184, "f": 13},
-                   50: {"e": 1.17, "Z": 425, "V1": 114, "V2": 215, "f": 17},
-                   60: {"e": 1.01, "Z": 492, "V1": 136, "V2": 242, "f": 19}},
-            7.25: {30: {"e": 1.70, "Z": 283, "V1": 69, "V2": 159, "f": 13},
-                   40: {"e": 1.35, "Z": 365, "V1": 92, "V2": 200, "f": 16},
-                   50: {"e": 1.13, "Z": 442, "V1": 114, "V2": 234, "f": 19},
-                   60: {"e": 0.97, "Z": 514, "V1": 136, "V2": 264, "f": 21}},
-            7.50: {30: {"e": 1.56, "Z": 293, "V1": 69, "V2": 172, "f": 14},
-                   40: {"e": 1.25, "Z": 379, "V1": 92, "V2": 216, "f": 18},
-                   50: {"e": 1.06, "Z": 460, "V1": 114, "V2": 254, "f": 21}},
-            7.75: {30: {"e": 1.45, "Z": 304, "V1": 69, "V2": 186, "f": 16},
-                   40: {"e": 1.15, "Z": 394, "V1": 92, "V2": 233, "f": 20},
-                   50: {"e": 0.98, "Z": 478, "V1": 114, "V2": 274, "f": 23}},
-            8.00: {30: {"e": 1.36, "Z": 314, "V1": 69, "V2": 198, "f": 18},
-                   40: {"e": 1.08, "Z": 408, "V1": 92, "V2": 250, "f": 22},
-                   50: {"e": 0.90, "Z": 495, "V1": 114, "V2": 296, "f": 26}},
-            8.25: {30: {"e": 1.25, "Z": 328, "V1": 69, "V2": 216, "f": 20},
-                   40: {"e": 1.01, "Z": 422, "V1": 92, "V2": 267, "f": 25}},
-            8.50: {30: {"e": 1.18, "Z": 336, "V1": 69, "V2": 227, "f": 22},
-                   40: {"e": 0.94, "Z": 436, "V1": 92, "V2": 287, "f": 27}},
-            8.75: {30: {"e": 1.12, "Z": 347, "V1": 69, "V2": 241, "f": 24},
-                   40: {"e": 0.88, "Z": 450, "V1": 92, "V2": 306, "f": 30}}
-        }
-    },
-    "SB-A+B+C": {
-        "heights": [5.50, 5.75, 6.00, 6.25, 6.50, 6.75],
-        "pressures": [30, 40, 50, 60],
-        "data": {
-            5.50: {40: {"e": 1.90, "Z": 266, "V1": 72, "V2": 140, "f": 7},
-                   50: {"e": 1.59, "Z": 318, "V1": 80, "V2": 160, "f": 9},
-                   60: {"e": 1.39, "Z": 365, "V1": 105, "V2": 177, "f": 9}},
-            5.75: {40: {"e": 1.71, "Z": 280, "V1": 72, "V2": 156, "f": 9},
-                   50: {"e": 1.49, "Z": 336, "V1": 72, "V2": 180, "f": 10},
-                   60: {"e": 1.31, "Z": 386, "V1": 105, "V2": 199, "f": 11}},
-            6.00: {40: {"e": 1.54, "Z": 294, "V1": 72, "V2": 172, "f": 10},
-                   50: {"e": 1.39, "Z": 354, "V1": 72, "V2": 200, "f": 11},
-                   60: {"e": 1.20, "Z": 407, "V1": 105, "V2": 222, "f": 12}},
-            6.25: {40: {"e": 1.39, "Z": 308, "V1": 72, "V2": 190, "f": 11},
-                   50: {"e": 1.20, "Z": 371, "V1": 72, "V2": 221, "f": 13},
-                   60: {"e": 1.08, "Z": 429, "V1": 105, "V2": 246, "f": 14}},
-            6.50: {30: {"e": 1.53, "Z": 251, "V1": 50, "V2": 170, "f": 10},
-                   40: {"e": 1.26, "Z": 322, "V1": 72, "V2": 208, "f": 13},
-                   50: {"e": 1.08, "Z": 389, "V1": 89, "V2": 233, "f": 15},
-                   60: {"e": 0.97, "Z": 450, "V1": 105, "V2": 272, "f": 17}},
-            6.75: {30: {"e": 1.41, "Z": 261, "V1": 50, "V2": 185, "f": 14},
-                   40: {"e": 1.17, "Z": 337, "V1": 72, "V2": 229, "f": 16},
-                   50: {"e": 1.00, "Z": 407, "V1": 89, "V2": 267, "f": 18},
-                   60: {"e": 0.87, "Z": 471, "V1": 105, "V2": 300, "f": 21}}
-        }
-    },
-    "SB-B+C": {
-        "heights": [3.75, 4.00, 4.25, 4.50, 4.75, 5.00],
-        "pressures": [40, 50, 60],
-        "data": {
-            3.75: {40: {"e": 2.42, "Z": 167, "V1": 51, "V2": 82, "f": 3},
-                   50: {"e": 2.11, "Z": 195, "V1": 63, "V2": 83, "f": 3},
-                   60: {"e": 2.05, "Z": 216, "V1": 73, "V2": 94, "f": 4}},
-            4.00: {40: {"e": 2.25, "Z": 181, "V1": 51, "V2": 97, "f": 4},
-                   50: {"e": 1.93, "Z": 212, "V1": 63, "V2": 107, "f": 4},
-                   60: {"e": 1.75, "Z": 238, "V1": 73, "V2": 114, "f": 5}},
-            4.25: {40: {"e": 2.01, "Z": 195, "V1": 51, "V2": 114, "f": 4},
-                   50: {"e": 1.77, "Z": 229, "V1": 63, "V2": 114, "f": 5},
-                   60: {"e": 1.60, "Z": 259, "V1": 73, "V2": 136, "f": 6}},
-            4.50: {40: {"e": 1.77, "Z": 209, "V1": 51, "V2": 131, "f": 6},
-                   50: {"e": 1.60, "Z": 249, "V1": 63, "V2": 141, "f": 6},
-                   60: {"e": 1.43, "Z": 280, "V1": 73, "V2": 160, "f": 7}},
-            4.75: {40: {"e": 1.58, "Z": 223, "V1": 51, "V2": 151, "f": 7},
-                   50: {"e": 1.38, "Z": 265, "V1": 63, "V2": 171, "f": 8},
-                   60: {"e": 1.26, "Z": 301, "V1": 73, "V2": 185, "f": 8}},
-            5.00: {40: {"e": 1.40, "Z": 238, "V1": 51, "V2": 172, "f": 9},
-                   50: {"e": 1.20, "Z": 283, "V1": 63, "V2": 195, "f": 9},
-                   60: {"e": 1.10, "Z": 322, "V1": 73, "V2": 213, "f": 10}}
-        }
-    },
-    "SB-A+C": {
-        "heights": [2.75, 3.00, 3.25, 3.50, 3.75, 4.00],
-        "pressures": [40, 50, 60],
-        "data": {
-            2.75: {40: {"e": 3.00, "Z": 110, "V1": 60, "V2": 22, "f": 1},
-                   50: {"e": 2.60, "Z": 124, "V1": 60, "V2": 22, "f": 1},
-                   60: {"e": 2.40, "Z": 132, "V1": 75, "V2": 22, "f": 1}},
-            3.00: {40: {"e": 2.81, "Z": 125, "V1": 64, "V2": 28, "f": 1},
-                   50: {"e": 2.40, "Z": 143, "V1": 75, "V2": 30, "f": 1},
-                   60: {"e": 2.17, "Z": 153, "V1": 83, "V2": 30, "f": 1}},
-            3.25: {40: {"e": 2.69, "Z": 139, "V1": 67, "V2": 35, "f": 2},
-                   50: {"e": 2.09, "Z": 159, "V1": 80, "V2": 38, "f": 2},
-                   60: {"e": 2.01, "Z": 174, "V1": 90, "V2": 39, "f": 2}},
-            3.50: {40: {"e": 2.62, "Z": 153, "V1": 70, "V2": 43, "f": 3},
-                   50: {"e": 2.17, "Z": 177, "V1": 84, "V2": 47, "f": 3},
-                   60: {"e": 1.90, "Z": 195, "V1": 95, "V2": 49, "f": 3}},
-            3.75: {40: {"e": 2.28, "Z": 167, "V1": 71, "V2": 52, "f": 5},
-                   50: {"e": 2.12, "Z": 195, "V1": 86, "V2": 57, "f": 5},
-                   60: {"e": 1.83, "Z": 216, "V1": 100, "V2": 60, "f": 5}},
-            4.00: {40: {"e": 1.60, "Z": 181, "V1": 72, "V2": 63, "f": 7},
-                   50: {"e": 1.60, "Z": 212, "V1": 88, "V2": 69, "f": 7},
-                   60: {"e": 1.60, "Z": 238, "V1": 103, "V2": 74, "f": 7}}
-        }
-    },
-    "SB-B": {
-        "heights": [2.50, 2.75, 3.00, 3.25, 3.50, 3.75, 4.00],
-        "pressures": [40, 50, 60],
-        "data": {
-            2.50: {40: {"e": 3.00, "Z": 96, "V1": 48, "V2": 26, "f": 1},
-                   50: {"e": 2.60, "Z": 100, "V1": 59, "V2": 26, "f": 1},
-                   60: {"e": 2.40, "Z": 110, "V1": 59, "V2": 26, "f": 1}},
-            2.75: {40: {"e": 3.00, "Z": 110, "V1": 59, "V2": 34, "f": 1},
-                   50: {"e": 2.60, "Z": 124, "V1": 59, "V2": 34, "f": 1},
-                   60: {"e": 2.40, "Z": 132, "V1": 65, "V2": 36, "f": 1}},
-            3.00: {40: {"e": 2.80, "Z": 124, "V1": 51, "V2": 44, "f": 1},
-                   50: {"e": 2.60, "Z": 141, "V1": 62, "V2": 44, "f": 1},
-                   60: {"e": 2.20, "Z": 153, "V1": 70, "V2": 48, "f": 1}},
-            3.25: {40: {"e": 2.60, "Z": 139, "V1": 51, "V2": 56, "f": 1},
-                   50: {"e": 2.30, "Z": 159, "V1": 69, "V2": 60, "f": 1},
-                   60: {"e": 2.10, "Z": 174, "V1": 72, "V2": 61, "f": 2}},
-            3.50: {40: {"e": 2.55, "Z": 153, "V1": 51, "V2": 68, "f": 2},
-                   50: {"e": 2.25, "Z": 177, "V1": 69, "V2": 74, "f": 2},
-                   60: {"e": 2.05, "Z": 195, "V1": 73, "V2": 77, "f": 3}},
-            3.75: {40: {"e": 2.42, "Z": 167, "V1": 51, "V2": 82, "f": 3},
-                   50: {"e": 2.11, "Z": 194, "V1": 63, "V2": 90, "f": 3},
-                   60: {"e": 1.95, "Z": 216, "V1": 73, "V2": 95, "f": 4}},
-            4.00: {40: {"e": 2.25, "Z": 181, "V1": 51, "V2": 97, "f": 4},
-                   50: {"e": 1.93, "Z": 212, "V1": 63, "V2": 108, "f": 4},
-                   60: {"e": 1.75, "Z": 238, "V1": 73, "V2": 115, "f": 5}}
-        }
-    },
-    "SB-A": {
-        "heights": [2.50, 2.75, 3.00],
-        "pressures": [40, 50, 60],
-        "data": {
-            2.50: {40: {"e": 3.00, "Z": 96, "V1": 55, "V2": 16, "f": 1},
-                   50: {"e": 2.60, "Z": 100, "V1": 62, "V2": 17, "f": 1},
-                   60: {"e": 2.40, "Z": 110, "V1": 65, "V2": 17, "f": 1}},
-            2.75: {40: {"e": 3.00, "Z": 110, "V1": 60, "V2": 22, "f": 1},
-                   50: {"e": 2.60, "Z": 120, "V1": 65, "V2": 22, "f": 1},
-                   60: {"e": 2.40, "Z": 132, "V1": 75, "V2": 22, "f": 1}},
-            3.00: {40: {"e": 2.81, "Z": 125, "V1": 64, "V2": 28, "f": 1},
-                   50: {"e": 2.40, "Z": 141, "V1": 75, "V2": 30, "f": 1},
-                   60: {"e": 2.17, "Z": 153, "V1	element": 83, "V2": 30, "f": 1}}
-        }
-    },
-    "SB-1": {
-        "heights": [2.50, 2.75, 3.00, 3.25, 3.50, 3.75],
-        "pressures": [30, 40, 50],
-        "data": {
-            2.50: {30: {"e": 1.25, "Z": 81, "V1": 37, "V2": 21, "f": 2},
-                   40: {"e": 1.25, "Z": 86, "V1": 48, "V2": 22, "f": 2},
-                   50: {"e": 1.25, "Z": 106, "V1": 53, "V2": 22, "f": 2}},
-            2.75: {30: {"e": 1.25, "Z": 91, "V1": 38, "V2": 27, "f": 2},
-                   40: {"e": 1.25, "Z": 110, "V1": 49, "V2": 30, "f": 2},
-                   50: {"e": 1.25, "Z": 124, "V1": 57, "V2": 31, "f": 2}},
-            3.00: {30: {"e": 1.25, "Z": 102, "V1": 38, "V2": 35, "f": 2},
-                   40: {"e": 1.25, "Z": 125, "V1": 50, "V2": 40, "f": 3},
-                   50: {"e": 1.25, "Z": 142, "V1": 59, "V2": 42, "f": 3}},
-            3.25: {30: {"e": 1.25, "Z": 113, "V1": 38, "V2": 44, "f": 2},
-                   40: {"e": 1.25, "Z": 138, "V1": 58, "V2": 54, "f": 3},
-                   50: {"e": 1.25, "Z": 159, "V1": 59, "V2": 42, "f": 3}},
-            3.50: {30: {"e": 1.25, "Z": 123, "V1": 38, "V2": 54, "f": 3},
-                   40: {"e": 1.25, "Z": 153, "V1": 63, "V2": 46, "f": 2}},
-            3.75: {30: {"e": 1.25, "Z": 134, "V1": 38, "V2": 64, "f": 4}}
-        }
-    },
-    "SB-2": {
-        "heights": [3.50, 3.75, 4.00, 4.25, 4.50, 4.75, 5.00, 5.25, 5.50, 5.75, 6.00],
-        "pressures": [30, 40, 50],
-        "data": {
-            3.50: {30: {"e": 1.25, "Z": 123, "V1": 48, "V2": 40, "f": 2},
-                   40: {"e": 1.25, "Z": 153, "V1": 63, "V2": 46, "f": 2},
-                   50: {"e": 1.25, "Z": 177, "V1": 77, "V2": 50, "f": 2}},
-            3.75: {30: {"e": 1.25, "Z": 134, "V1": 48, "V2": 47, "f": 2},
-                   40: {"e": 1.25, "Z": 167, "V1": 63, "V2": 55, "f": 2},
-                   50: {"e": 1.25, "Z": 194, "V1": 78, "V2": 61, "f": 3}},
-            4.00: {30: {"e": 1.25, "Z": 144, "V1": 48, "V2": 56, "f": 2},
-                   40: {"e": 1.25, "Z": 181, "V1": 63, "V2": 66, "f": 3},
-                   50: {"e": 1.25, "Z": 212, "V1": 78, "V2": 74, "f": 3}},
-            4.25: {30: {"e": 1.25, "Z": 155, "V1": 48, "V2": 66, "f": 3},
-                   40: {"e": 1.25, "Z": 195, "V1": 63, "V2": 78, "f": 3},
-                   50: {"e": 1.25, "Z": 230, "V1": 78, "V2": 87, "f": 4}},
-            4.50: {30: {"e": 1.25, "Z": 166, "V1": 48, "V2": 76, "f": 3},
-                   40: {"e": 1.25, "Z": 210, "V1": 63, "V2": 91, "f": 4},
-                   50: {"e": 1.25, "Z": 247, "V1": 78, "V2": 102, "f": 5}},
-            4.75: {30: {"e": 1.25, "Z": 176, "V1": 48, "V2": 87, "f": 4},
-                   40: {"e": 1.25, "Z": 223, "V1": 63, "V2": 105, "f": 5},
-                   50: {"e": 1.25, "Z": 265, "V1": 78, "V2": 118, "f": 5}},
-            5.00: {30: {"e": 1.25, "Z": 186, "V1": 48, "V2": 98, "f": 4},
-                   40: {"e": 1.25, "Z": 238, "V1": 63, "V2": 120, "f": 6},
-                   50: {"e": 1.25, "Z": 283, "V1": 78, "V2": 135, "f": 6}},
-            5.25: {30: {"e": 1.25, "Z": 198, "V1": 48, "V2": 111, "f": 5},
-                   40: {"e": 1.25, "Z": 252, "V1": 63, "V2": 135, "f": 6},
-                   50: {"e": 1.25, "Z": 301, "V1": 78, "V2": 154, "f": 6}},
-            5.50: {30: {"e": 1.25, "Z": 208, "V1": 48, "V2": 124, "f": 6},
-                   40: {"e": 1.25, "Z": 266, "V1": 63, "V2": 152, "f": 7},
-                   50: {"e": 1.25, "Z": 318, "V1": 78, "V2": 174, "f": 8}},
-            5.75: {30: {"e": 1.25, "Z": 218, "V1": 48, "V2": 138, "f": 6},
-                   40: {"e": 1.25, "Z": 280, "V1": 63, "V2": 170, "f": 8},
-                   50: {"e": 1.25, "Z": 336, "V1": 78, "V2": 195, "f": 9}},
-            6.00: {30: {"e": 1.25, "Z": 229, "V1": 48, "V2": 153, "f": 7},
-                   40: {"e": 1.25, "Z": 294, "V1": 63, "V2": 188, "f": 9},
-                   50: {"e": 1.25, "Z": 354, "V1": 78, "V2": 218, "f": 10}}
-        }
-    }
-}
-
-def interpolate_value(x, x0, x1, y0, y1):
-    """Linear interpolation between two points."""
-    return y0 + (y1 - y0) * (x - x0) / (x1 - x0)
-
-def get_loads(brace_type, height, pressure):
-    """Retrieve or interpolate loads based on user input."""
-    if brace_type not in brace_frame_data:
-        return "Brace frame type not supported."
-    
-    data = brace_frame_data[brace_type]["data"]
-    heights = brace_frame_data[brace_type]["heights"]
-    pressures = brace_frame_data[brace_type]["pressures"]
-
-    if height < min(heights) or height > max(heights) or pressure < min(pressures) or pressure > max(pressures):
-        return f"Input out of range for {brace_type}. Height range: {min(heights)}-{max(heights)} m, Pressure range: {min(pressures)}-{max(pressures)} kN/m²."
-
-    h_low = max([h for h in heights if h <= height])
-    h_high = min([h for h in heights if h >= height])
-    p_low = max([p for p in pressures if p <= pressure])
-    p_high = min([p for p in pressures if p >= pressure])
-
-    if h_high not in data or p_high not in data[h_high]:
-        return f"Data not available for {brace_type} at height {h_high} m and pressure {p_high} kN/m²."
-
-    if h_low == h_high and p_low == p_high:
-        return data[h_low][p_low]
-
-    if h_low == h_high:
-        loads_low = data[h_low][p_low]
-        loads_high = data[h_low][p_high]
-        result = {}
-        for key in ["e", "Z", "V1", "V2", "f"]:
-            result[key] = interpolate_value(pressure, p_low, p_high, loads_low[key], loads_high[key])
-        return result
-    elif p_low == p_high:
-        loads_low = data[h_low][p_low]
-        loads_high = data[h_high][p_low]
-        result = {}
-        for key in ["e", "Z", "V1", "V2", "f"]:
-            result[key] = interpolate_value(height, h_low, h_high, loads_low[key], loads_high[key])
-        return result
-    else:
-        loads_ll = data[h_low][p_low]
-        loads_lh = data[h_low][p_high] if p_high in data[h_low] else data[h_low][p_low]
-        loads_hl = data[h_high][p_low]
-        loads_hh = data[h_high][p_high] if p_high in data[h_high] else data[h_high][p_low]
-        result = {}
-        for key in ["e", "Z", "V1", "V2", "f"]:
-            low_interp = interpolate_value(pressure, p_low, p_high, loads_ll[key], loads_lh[key]) if p_high in data[h_low] else loads_ll[key]
-            high_interp = interpolate_value(pressure, p_low, p_high, loads_hl[key], loads_hh[key]) if p_high in data[h_high] else loads_hl[key]
-            result[key] = interpolate_value(height, h_low, h_high, low_interp, high_interp)
-        return result
-
-def validate_bracing(brace_type, height, e):
-    """Validate diagonal bracing requirements based on document notes."""
-    validation_messages = []
-
-    if "SB-" in brace_type and ("A" in brace_type or "B" in brace_type or "C" in brace_type):
-        validation_messages.append("Recommendation: Pre-incline the Brace Frame by 2/3 of the calculated deflection.")
-
-    if brace_type == "SB-A+B":
-        if e <= 1.35 and height <= 5.25:
-            validation_messages.append("Diagonal Bracing B can be omitted during concreting.")
-        else:
-            validation_messages.append("Required: Diagonal Bracing A and B for concreting.")
-        validation_messages.append("Required: Diagonal Bracing for moving and lifting the formwork unit with the crane.")
-    elif brace_type == "SB-A0+A+B+C":
-        validation_messages.append("Required: Diagonal Bracing A, B, and C for concreting, horizontally moving, and lifting the formwork unit with the crane.")
-    elif brace_type == "SB-A+B+C":
-        validation_messages.append("Required: Diagonal Bracing A, B, and C for concreting.")
-        validation_messages.append("Required: Diagonal Bracing for horizontally moving and lifting the formwork unit with the crane.")
-    elif brace_type == "SB-B+C":
-        if e <= 1.35 and height <= 4.25:
-            validation_messages.append("Diagonal Bracing B can be omitted during concreting.")
-        else:
-            validation_messages.append("Required: Diagonal Bracing B and C for concreting.")
-        validation_messages.append("Required: Diagonal Bracing B or D for lifting with the crane.")
-    elif brace_type == "SB-A+C":
-        validation_messages.append("No diagonal bracing required for concreting.")
-        validation_messages.append("Required: Diagonal Bracing C for moving and lifting the formwork unit with the crane.")
-    elif brace_type == "SB-B":
-        if e > 1.35 and height >= 3.75:
-            validation_messages.append("Required: Diagonal Bracing B for concreting.")
-        else:
-            validation_messages.append("No diagonal bracing required for concreting until height reaches 3.75 m if e ≤ 1.35 m.")
-        validation_messages.append("Required: Diagonal Bracing for moving and lifting the formwork unit with the crane.")
-    elif brace_type == "SB-A":
-        validation_messages.append("No diagonal bracing required for concreting.")
-        validation_messages.append("Required: Diagonal Bracing C for moving and lifting the formwork unit with the crane.")
-    elif brace_type == "SB-1":
-        validation_messages.append("No diagonal bracing required for concreting.")
-        validation_messages.append("Required: Diagonal Bracing for moving and lifting the formwork unit with the crane.")
-        if e > 1.25:
-            validation_messages.append("Warning: Permissible width of influence exceeds maximum of 1.25 m.")
-    elif brace_type == "SB-2":
-        if height >= 5.00:
-            validation_messages.append("Required: Diagonal Bracing for concreting (height ≥ 5.00 m).")
-        else:
-            validation_messages.append("No diagonal bracing required for concreting (height < 5.00 m).")
-        validation_messages.append("Required: Diagonal Bracing for moving and lifting the formwork unit with the crane.")
-        if e > 1.25:
-            validation_messages.append("Warning: Permissible width of influence exceeds maximum of 1.25 m.")
-
-    return validation_messages
-
-def build_pdf_elements(brace_type, height, pressure, result, validation_messages, project_number, project_name):
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(name='TitleStyle', parent=styles['Title'], fontSize=14, spaceAfter=8, alignment=TA_CENTER)
-    subtitle_style = ParagraphStyle(name='SubtitleStyle', parent=styles['Normal'], fontSize=10, spaceAfter=8, alignment=TA_CENTER)
-    heading_style = ParagraphStyle(name='HeadingStyle', parent=styles['Heading2'], fontSize=12, spaceAfter=6)
-    normal_style = ParagraphStyle(name='NormalStyle', parent=styles['Normal'], fontSize=9, spaceAfter=6)
-    table_header_style = ParagraphStyle(name='TableHeaderStyle', parent=styles['Normal'], fontSize=10, fontName='Helvetica-Bold', alignment=TA_LEFT)
-    table_cell_style = ParagraphStyle(name='TableCellStyle', parent=styles['Normal'], fontSize=8, alignment=TA_LEFT, leading=8)
-    table_style = TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 2),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('LEFTPADDING', (0, 0), (-1, -1), 4),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-    ])
-
-    elements = []
-    logo_file = "logo.png"
-    if not os.path.exists(logo_file):
-        for url in [LOGO_URL, FALLBACK_LOGO_URL]:
-            try:
-                response = requests.get(url, stream=True, allow_redirects=True, timeout=10)
-                if 'image' in response.headers.get('Content-Type', '').lower():
-                    response.raise_for_status()
-                    with open(logo_file, 'wb') as f:
-                        f.write(response.content)
-                    break
-            except Exception:
-                continue
-
-    company_text = f"<b>{COMPANY_NAME}</b><br/>{COMPANY_ADDRESS}"
-    company_paragraph = Paragraph(company_text, normal_style)
-    logo = Image(logo_file, width=50*mm, height=20*mm) if os.path.exists(logo_file) else Paragraph("[Logo Placeholder]", normal_style)
-    header_data = [[logo, company_paragraph]]
-    header_table = Table(header_data, colWidths=[60*mm, 120*mm])
-    header_table.setStyle(TableStyle([('VALIGN', (0, 0), (-1, -1), 'TOP'), ('ALIGN', (1, 0), (1, 0), 'CENTER')]))
-    elements.extend([header_table, Spacer(1, 4*mm), Paragraph("PERI Brace Frame Load Calculation Report", title_style)])
-
-    project_details = f"Project Number: {project_number}<br/>Project Name: {project_name}<br/>Date: {datetime.now().strftime('%B %d, %Y')}"
-    elements.extend([Paragraph(project_details, subtitle_style), Spacer(1, 2*mm), Paragraph("Input Parameters", heading_style)])
-
-    input_data = [
-        ["Parameter", "Value"],
-        ["Brace Frame Type", brace_type],
-        ["Concreting Height (m)", f"{height:.2f}"],
-        ["Fresh Concrete Pressure (kN/m²)", f"{pressure:.2f}"],
-    ]
-    input_table = Table([[Paragraph(row[0], table_header_style if i == 0 else table_cell_style),
-                          Paragraph(row[1], table_header_style if i == 0 else table_cell_style)] for i, row in enumerate(input_data)],
-                        colWidths=[100*mm, 80*mm])
-    input_table.setStyle(table_style)
-    elements.extend([input_table, Spacer(1, 4*mm), Paragraph("Calculated Loads (Per Meter)", heading_style)])
-
-    loads_data = [
-        ["Parameter", "Value"],
-        ["Permissible Width of Influence (e)", f"{result['e']:.2f} m"],
-        ["Anchor Tension Force (Z)", f"{result['Z']:.2f} kN/m"],
-        ["Spindle Force V1", f"{result['V1']:.2f} kN/m"],
-        ["Spindle Force V2", f"{result['V2']:.2f} kN/m"],
-        ["Deflection (f)", f"{result['f']:.2f} mm/m"],
-    ]
-    loads_table = Table([[Paragraph(row[0], table_header_style if i == 0 else table_cell_style),
-                          Paragraph(row[1], table_header_style if i == 0 else table_cell_style)] for i, row in enumerate(loads_data)],
-                        colWidths=[100*mm, 80*mm])
-    loads_table.setStyle(table_style)
-    elements.extend([loads_table, Spacer(1, 4*mm), Paragraph(f"Final Values Based on {result['e']:.2f} m Spacing", heading_style)])
-
-    final_data = [
-        ["Parameter", "Value"],
-        ["Anchor Tension Force (Z)", f"{result['Z'] * result['e']:.2f} kN"],
-        ["Spindle Force V1", f"{result['V1'] * result['e']:.2f} kN"],
-        ["Spindle Force V2", f"{result['V2'] * result['e']:.2f} kN"],
-        ["Deflection (f)", f"{result['f'] * result['e']:.2f} mm"],
-    ]
-    final_table = Table([[Paragraph(row[0], table_header_style if i == 0 else table_cell_style),
-                          Paragraph(row[1], table_header_style if i == 0 else table_cell_style)] for i, row in enumerate(final_data)],
-                        colWidths=[100*mm, 80*mm])
-    final_table.setStyle(table_style)
-    elements.extend([final_table, Spacer(1, 4*mm), Paragraph("Validation and Notes", heading_style)])
-
-    notes_data = [["Notes"]] + [[Paragraph(msg, table_cell_style)] for msg in validation_messages]
-    notes_table = Table(notes_data, colWidths=[180*mm])
-    notes_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 2),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('LEFTPADDING', (0, 0), (-1, -1), 4),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(notes_table)
-    return elements
-
-def generate_pdf_report(brace_type, height, pressure, result, validation_messages, project_number, project_name):
-    pdf_buffer = io.BytesIO()
-    doc = SimpleDocTemplate(pdf_buffer, pagesize=A4, leftMargin=15*mm, rightMargin=15*mm, topMargin=15*mm, bottomMargin=15*mm)
-    elements = build_pdf_elements(brace_type, height, pressure, result, validation_messages, project_number, project_name)
-
-    def footer(canvas, doc):
-        canvas.saveState()
-        canvas.setFont('Helvetica', 10)
-        page_num = canvas.getPageNumber()
-        canvas.drawCentredString(doc.pagesize[0] / 2.0, 10 * mm, f"{PROGRAM} {PROGRAM_VERSION} | tekhne © | Page {page_num}")
-        canvas.restoreState()
-
-    doc.build(elements, onFirstPage=footer, onLaterPages=footer)
-    pdf_buffer.seek(0)
-    return pdf_buffer.getvalue()
-
-# Streamlit app
-st.title("PERI Brace Frame Load Calculator")
-
-# Sidebar for inputs
-st.sidebar.header("Input Parameters")
-brace_type = st.sidebar.selectbox("Brace Frame Type", list(brace_frame_data.keys()))
-height = st.sidebar.number_input("Concreting Height (m)", min_value=2.50, max_value=8.75, step=0.01, value=5.50)
-pressure = st.sidebar.number_input("Fresh Concrete Pressure (kN/m²)", min_value=30, max_value=60, step=1, value=60)
-project_number = st.sidebar.text_input("Project Number", "PRJ-001")
-project_name = st.sidebar.text_input("Project Name", "Sample Project")
-
-# Calculate loads
-result = get_loads(brace_type, height, pressure)
-
-# Display results
-st.header("Results")
-if isinstance(result, str):
-    st.error(result)
-else:
-    st.write(f"**Brace Frame:** {brace_type}")
-    st.write(f"**Concreting Height:** {height} m")
-    st.write(f"**Fresh Concrete Pressure:** {pressure} kN/m²")
-    
-    st.subheader("Calculated Loads (Per Meter)")
+# Time every rerun and log it as JSON; the sidebar panel also enables it per session
+TIMING_ENABLED = os.environ.get("PERI_SB_TIMING", "0") != "0"
+# Seconds between status checks of a rendering report
+JOB_POLL_INTERVAL = 0.5
+
+def job_owner():
+    """This session's owner id for the report job queue."""
+    return st.session_state.setdefault("job_owner", uuid.uuid4().hex)
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def render_job_progress(job_id, text, cancellable=False):
+    """Spinner and progress of a queued or running report job; reruns the page once it has finished."""
+    try:
+        status = report_jobs.status(job_id)
+    except KeyError:
+        # Fetched by another session with the same request; the rerun submits it again
+        st.rerun()
+    if status["status"] not in (QUEUED, RUNNING):
+        st.rerun()
+    label = text if status["status"] == RUNNING else f"{text} (queued, position {status['position']})"
+    with st.status(label, state="running"):
+        if status["progress"] and status["progress"][1]:
+            done, total = status["progress"]
+            st.progress(done / total, text=f"{done} of {total}")
+        st.caption(f"{status['elapsed_s']:.1f} s")
+    if cancellable:
+        st.button("Cancel", key=f"cancel_{job_id}", on_click=report_jobs.cancel, args=(job_id,))
+
+def job_result(job_id, text, request, cancellable=False):
+    """Result of a report job, or None while it renders or if it failed or was cancelled.
+
+    The result is handed over once: the caller keeps it (or finds it in a cache)
+    and clears its request. A failed or cancelled job clears the session's
+    request for it, so it is not resubmitted until asked for again. The job's
+    run time (as stage "<request>.render") and stages go into this rerun's timing.
+    """
+    try:
+        status = report_jobs.status(job_id)
+        if status["status"] in (QUEUED, RUNNING):
+            render_job_progress(job_id, text, cancellable)
+            return None
+        if status["timing"] is not None:
+            add_record(f"{request.removesuffix('_request')}.render", status["timing"])
+        if status["status"] in (FAILED, CANCELLED):
+            st.session_state.pop(request, None)
+            if status["status"] == FAILED:
+                st.error(f"Rendering failed: {status['error']}")
+            return None
+        return report_jobs.result(job_id)
+    except KeyError:
+        # Fetched by another session with the same request in the meantime
+        st.rerun()
+
+def render_schedule_page():
+    """Batch calculation of an uploaded wall schedule."""
+    st.header("Wall Schedule")
+    st.write("Upload a CSV file with the columns: " + ", ".join(SCHEDULE_COLUMNS) + ".")
+    st.write(f"Use the brace type \"{AUTO_BRACE_TYPE}\" to let the optimizer choose the type for a segment.")
+    objective = st.selectbox("Objective for Auto-selected Types", list(OBJECTIVES), format_func=lambda name: OBJECTIVES[name][0])
+    interpolation = st.selectbox("Interpolation", list(INTERPOLATION_MODES), format_func=INTERPOLATION_MODES.get)
+    uploaded = st.file_uploader("Wall Schedule (CSV)", type=["csv"])
+    if uploaded is None:
+        return
+
+    table = st.empty()
+    schedule_key = (uploaded.file_id, current_catalog().version, objective, interpolation)
+    if st.session_state.get("schedule_key") != schedule_key:
+        progress = st.progress(0.0, text="Processing wall schedule...")
+        chunks = []
+        segments = 0
+        text = io.TextIOWrapper(uploaded, encoding="utf-8-sig", newline="")
+        try:
+            for chunk in read_schedule_chunks(text):
+                with stage("compute_schedule"):
+                    chunks.append(compute_schedule(chunk, objective, interpolation))
+                segments += len(chunks[-1]["id"])
+                progress.progress(min(uploaded.tell() / max(uploaded.size, 1), 1.0), text=f"Processed {segments} segments...")
+                # Only the latest chunk is sent while processing; the full table is shown once at the end
+                table.dataframe(chunks[-1])
+        except ValueError as exc:
+            progress.empty()
+            st.error(str(exc))
+            return
+        finally:
+            text.detach()
+        progress.empty()
+        st.session_state["schedule_key"] = schedule_key
+        st.session_state["schedule_results"] = concat_schedule(chunks)
+
+    results = st.session_state["schedule_results"]
+    table.dataframe(results)
+    failed = int(np.count_nonzero(results["status"] != "OK"))
+    st.write(f"**Segments:** {len(results['id'])}  |  **Not calculated:** {failed}")
+
+    stem = os.path.splitext(uploaded.name)[0]
     col1, col2 = st.columns(2)
     with col1:
-        st.write(f"Permissible Width of Influence (e): **{result['e']:.2f} m**")
-        st.write(f"Anchor Tension Force (Z): **{result['Z']:.2f} kN/m**")
-        st.write(f"Spindle Force V1: **{result['V1']:.2f} kN/m**")
+        st.download_button("Download Results (CSV)", data=lambda: schedule_to_csv(results), file_name=f"{stem}_results.csv", mime="text/csv")
     with col2:
-        st.write(f"Spindle Force V2: **{result['V2']:.2f} kN/m**")
-        st.write(f"Deflection (f): **{result['f']:.2f} mm/m**")
-
-    st.subheader(f"Final Values Based on {result['e']:.2f} m Spacing")
-    final_Z = result['Z'] * result['e']
-    final_V1 = result['V1'] * result['e']
-    final_V2 = result['V2'] * result['e']
-    final_f = result['f'] * result['e']
-    col3, col4 = st.columns(2)
-    with col3:
-        st.write(f"Anchor Tension Force (Z): **{final_Z:.2f} kN**")
-        st.write(f"Spindle Force V1: **{final_V1:.2f} kN**")
-    with col4:
-        st.write(f"Spindle Force V2: **{final_V2:.2f} kN**")
-        st.write(f"Deflection (f): **{final_f:.2f} mm**")
-
-    st.subheader("Validation and Notes")
-    validation_messages = validate_bracing(brace_type, height, result['e'])
-    for message in validation_messages:
-        if "Warning" in message:
-            st.warning(message)
-        elif "Required" in message:
-            st.info(message)
+        st.download_button("Download Results (JSON)", data=lambda: schedule_to_json(results), file_name=f"{stem}_results.json", mime="application/json")
+
+    st.subheader("Project Report")
+    project_number = st.text_input("Project Number", "PRJ-001", key="schedule_project_number")
+    project_name = st.text_input("Project Name", "Sample Project", key="schedule_project_name")
+    report_key = (schedule_key, project_number, project_name)
+    if st.button("Generate Project Report"):
+        st.session_state["project_report_request"] = report_key
+    report = st.session_state.get("project_report")
+    if st.session_state.get("project_report_request") == report_key and not (report and report[0] == report_key):
+        job_id = report_jobs.submit(("project_report",) + report_key, generate_project_report, results, project_number, project_name, owner=job_owner())
+        finished = job_result(job_id, "Rendering project report...", "project_report_request")
+        if finished is not None:
+            report = (report_key,) + finished
+            st.session_state["project_report"] = report
+            st.session_state.pop("project_report_request", None)
+    if report and report[0] == report_key:
+        _, pdf_data, page_times = report
+        st.caption(f"{len(page_times)} pages in {sum(page_times):.2f} s; "
+                   f"per page: mean {1000 * np.mean(page_times):.1f} ms, max {1000 * np.max(page_times):.1f} ms.")
+        st.download_button("Download Project Report (PDF)", data=pdf_data,
+                           file_name=f"PERI_Brace_Frame_Project_Report_{project_name.replace(' ', '_')}.pdf", mime="application/pdf")
+
+    st.subheader("Segment Reports")
+    if st.button("Export Segment Reports (ZIP)"):
+        st.session_state["zip_request"] = report_key
+    export = st.session_state.get("segment_zip")
+    if st.session_state.get("zip_request") == report_key and not (export and export[0] == report_key):
+        # At most per_owner renders in flight, so the export leaves a render slot for other sessions
+        job_id = report_jobs.submit(("segment_zip",) + report_key, export_segment_zip, results, project_number, project_name,
+                                    workers=report_jobs.per_owner, owner=job_owner(), progress=True, parallel=True,
+                                    discard=discard_segment_zip)
+        finished = job_result(job_id, "Rendering segment reports...", "zip_request", cancellable=True)
+        if finished is not None:
+            # The session owns the file from here on; it is removed when replaced by the next export
+            if export and os.path.exists(export[1]):
+                os.remove(export[1])
+            export = (report_key,) + finished
+            st.session_state["segment_zip"] = export
+            st.session_state.pop("zip_request", None)
+    if export and export[0] == report_key and os.path.exists(export[1]):
+        with open(export[1], "rb") as zip_file:
+            st.download_button(f"Download {export[2]} Segment Reports (ZIP)", data=zip_file,
+                               file_name=f"PERI_Brace_Frame_Segment_Reports_{project_name.replace(' ', '_')}.zip", mime="application/zip")
+
+def render_pour_page():
+    """Loads and bracing requirements at every stage of a rising pour."""
+    st.sidebar.header("Pour Parameters")
+    brace_type = st.sidebar.selectbox("Brace Frame Type", current_catalog().brace_types, key="pour_brace_type")
+    final_height = st.sidebar.number_input("Final Concreting Height (m)", min_value=2.50, max_value=8.75, step=0.01, value=5.50, key="pour_final_height")
+    pour_step = st.sidebar.number_input("Pour Step (m)", min_value=0.01, max_value=2.00, step=0.01, value=0.25, key="pour_step")
+    pressure = st.sidebar.number_input("Fresh Concrete Pressure (kN/m²)", min_value=30, max_value=60, step=1, value=40, key="pour_pressure")
+
+    st.header("Pour Sequence")
+    with stage("pour_sequence"):
+        try:
+            results = pour_sequence(brace_type, final_height, pour_step, pressure)
+        except ValueError as exc:
+            st.error(str(exc))
+            return
+
+    calculated = results["status"] == "OK"
+    if not calculated.any():
+        st.error(results["status"][-1])
+        return
+    st.subheader("Final Values per Stage")
+    st.line_chart({
+        "Height (m)": results["height"][calculated],
+        "Z (kN)": results["final_Z"][calculated],
+        "V1 (kN)": results["final_V1"][calculated],
+        "V2 (kN)": results["final_V2"][calculated],
+        "f (mm)": results["final_f"][calculated],
+    }, x="Height (m)")
+
+    st.subheader("Bracing Requirement Changes")
+    changes = requirement_changes(results)
+    for height, added, dropped in changes:
+        st.warning(f"**From {height:.2f} m:** " + " ".join(added) + (f" (replaces: {' '.join(dropped)})" if dropped else ""))
+    if not changes:
+        st.success("The bracing requirements do not change during the pour.")
+
+    st.subheader("Stages")
+    st.dataframe({column: results[column] for column in POUR_COLUMNS}, hide_index=True)
+    failed = int(np.count_nonzero(~calculated))
+    if failed:
+        st.info(f"{failed} stage(s) could not be calculated; see the status column.")
+
+    stem = f"PERI_Pour_Sequence_{brace_type}_{final_height:.2f}m"
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("Download Stages (CSV)", data=lambda: schedule_to_csv(results, POUR_COLUMNS), file_name=f"{stem}.csv", mime="text/csv")
+    with col2:
+        st.download_button("Download Stages (JSON)", data=lambda: schedule_to_json(results, POUR_COLUMNS), file_name=f"{stem}.json", mime="application/json")
+
+def render_single_page():
+    """Single (brace_type, height, pressure) calculation with PDF report."""
+    # Sidebar for inputs
+    st.sidebar.header("Input Parameters")
+    auto_select = st.sidebar.checkbox("Auto-select Brace Frame Type")
+    if auto_select:
+        objective = st.sidebar.selectbox("Objective", list(OBJECTIVES), format_func=lambda name: OBJECTIVES[name][0])
+    else:
+        brace_type = st.sidebar.selectbox("Brace Frame Type", current_catalog().brace_types)
+    height = st.sidebar.number_input("Concreting Height (m)", min_value=2.50, max_value=8.75, step=0.01, value=5.50)
+    pressure = st.sidebar.number_input("Fresh Concrete Pressure (kN/m²)", min_value=30, max_value=60, step=1, value=60)
+    project_number = st.sidebar.text_input("Project Number", "PRJ-001")
+    project_name = st.sidebar.text_input("Project Name", "Sample Project")
+
+    if auto_select:
+        st.header("Brace Frame Options")
+        with stage("rank_brace_types"):
+            ranking = rank_brace_types(height, pressure, objective)
+        if not ranking:
+            st.error(f"No brace frame type is admissible at {height:.2f} m and {pressure} kN/m².")
+            return
+        st.dataframe({
+            "Brace Frame": [option["brace_type"] for option in ranking],
+            "e (m)": [round(option["e"], 2) for option in ranking],
+            "Z final (kN)": [round(option["final_Z"], 2) for option in ranking],
+            "V1 final (kN)": [round(option["final_V1"], 2) for option in ranking],
+            "V2 final (kN)": [round(option["final_V2"], 2) for option in ranking],
+            "f final (mm)": [round(option["final_f"], 2) for option in ranking],
+        }, hide_index=True)
+        brace_type = ranking[0]["brace_type"]
+        st.success(f"Selected: {brace_type} ({OBJECTIVES[objective][0]}).")
+
+    # Calculate loads; results are shared with other sessions through the process-wide cache
+    result, validation_messages = cached_calculation(brace_type, height, pressure)
+
+    # Display results
+    st.header("Results")
+    if not result.ok:
+        st.error(result.message)
+    else:
+        st.write(f"**Brace Frame:** {brace_type}")
+        st.write(f"**Concreting Height:** {height} m")
+        st.write(f"**Fresh Concrete Pressure:** {pressure} kN/m²")
+
+        st.subheader("Calculated Loads (Per Meter)")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write(f"Permissible Width of Influence (e): **{result.e:.2f} m**")
+            st.write(f"Anchor Tension Force (Z): **{result.Z:.2f} kN/m**")
+            st.write(f"Spindle Force V1: **{result.V1:.2f} kN/m**")
+        with col2:
+            st.write(f"Spindle Force V2: **{result.V2:.2f} kN/m**")
+            st.write(f"Deflection (f): **{result.f:.2f} mm/m**")
+
+        st.subheader(f"Final Values Based on {result.e:.2f} m Spacing")
+        col3, col4 = st.columns(2)
+        with col3:
+            st.write(f"Anchor Tension Force (Z): **{result.final_Z:.2f} kN**")
+            st.write(f"Spindle Force V1: **{result.final_V1:.2f} kN**")
+        with col4:
+            st.write(f"Spindle Force V2: **{result.final_V2:.2f} kN**")
+            st.write(f"Deflection (f): **{result.final_f:.2f} mm**")
+
+        st.subheader("Validation and Notes")
+        for message in validation_messages:
+            if "Warning" in message:
+                st.warning(message)
+            elif "Required" in message:
+                st.info(message)
+            else:
+                st.success(message)
+
+        with st.expander("Maximum Height or Pressure for a Capacity"):
+            units = {"Z": "kN", "V1": "kN", "V2": "kN", "f": "mm"}
+            key = st.selectbox("Limited Final Value", INVERSE_KEYS, format_func=lambda name: f"{name} ({units[name]})")
+            limit = st.number_input(f"Capacity ({units[key]})", min_value=0.0, value=300.0, step=1.0)
+            with stage("inverse"):
+                top_height = max_height(brace_type, key, limit, pressure)
+                top_pressure = max_pressure(brace_type, key, limit, height)
+            if np.isnan(top_height):
+                st.write(f"At {pressure} kN/m², no height of {brace_type} keeps final {key} within {limit:g} {units[key]}.")
+            else:
+                st.write(f"Maximum concreting height at {pressure} kN/m²: **{top_height:.2f} m**")
+            if np.isnan(top_pressure):
+                st.write(f"At {height:.2f} m, no pressure keeps final {key} within {limit:g} {units[key]}.")
+            else:
+                st.write(f"Maximum fresh concrete pressure at {height:.2f} m: **{top_pressure:g} kN/m²**")
+
+        st.subheader("Load Surfaces")
+        if st.checkbox("Show Load Surfaces"):
+            with stage("load_surfaces"):
+                st.image(load_surface_png(brace_type, height, pressure), caption=f"{brace_type} over its full height and pressure range; the current input is marked in red.")
+
+        # Build the PDF only on request, in the background; once rendered, reruns with unchanged inputs read it from the PDF cache
+        report_date = datetime.now().strftime('%Y-%m-%d')
+        include_surfaces = st.checkbox("Include Load Surfaces in PDF Report")
+        pdf_key = (brace_type, height, pressure, project_number, project_name, current_catalog().version, report_date, include_surfaces)
+        if st.button("Generate PDF Report"):
+            st.session_state["pdf_request"] = pdf_key
+        pdf_data = None
+        if st.session_state.get("pdf_request") == pdf_key:
+            pdf_args = (brace_type, height, pressure, project_number, project_name, report_date, include_surfaces)
+            # A render still in the queue is fetched before the cache is read, so its timing reaches a rerun
+            job_id = report_jobs.find(("pdf",) + pdf_key)
+            if job_id is None:
+                pdf_data = rendered_pdf_report(*pdf_args)
+            if pdf_data is None:
+                job_id = job_id or report_jobs.submit(("pdf",) + pdf_key, prerender_pdf_report, *pdf_args, owner=job_owner())
+                if job_result(job_id, "Rendering PDF report...", "pdf_request") is not None:
+                    # Rendered into the PDF cache; renders here only if it has been evicted since
+                    pdf_data = cached_pdf_report(*pdf_args)
+        if pdf_data is not None:
+            st.download_button(
+                label="Download PDF Report",
+                data=pdf_data,
+                file_name=f"PERI_Brace_Frame_Calculation_Report_{project_name.replace(' ', '_')}.pdf",
+                mime="application/pdf"
+            )
+
+def render_timing_panel(timer):
+    """Latest and rolling p50/p95 stage timings of this session and the shared cache counters."""
+    summary = timer.summary()
+    with st.sidebar.expander("Stage Timings (ms)", expanded=True):
+        st.dataframe({
+            "Stage": list(summary),
+            "Latest": [entry["latest"] for entry in summary.values()],
+            "p50": [entry["p50"] for entry in summary.values()],
+            "p95": [entry["p95"] for entry in summary.values()],
+        }, hide_index=True)
+        st.caption(f"Over the last {len(timer.history)} reruns of this session.")
+    with st.sidebar.expander("Shared Cache"):
+        for name, stats in cache_stats().items():
+            hit_rate = "n/a" if stats["hit_rate"] is None else f"{stats['hit_rate']:.0%}"
+            st.caption(f"**{name}:** {stats['entries']}/{stats['max_entries']} entries, {stats['hits']} hits, "
+                       f"{stats['misses']} misses ({hit_rate}), {stats['evictions']} evicted, {stats['expirations']} expired")
+        jobs = report_jobs.stats()
+        st.caption(f"**report jobs:** {jobs['running']}/{jobs['workers']} rendering, {jobs['queued']} queued, {jobs['finished']} finished")
+
+# Streamlit app
+timer = None
+page = None
+if TIMING_ENABLED or st.session_state.get("show_timings"):
+    timer = st.session_state.setdefault("stage_timer", StageTimer())
+    timing_token = timer.start()
+try:
+    prefetch_logo()
+    st.title("PERI Brace Frame Load Calculator")
+
+    page = st.sidebar.radio("Mode", ["Single Calculation", "Pour Sequence", "Wall Schedule"])
+    # Each session can use its own catalog edition; editions are loaded once per process
+    editions = available_editions()
+    edition = st.sidebar.selectbox("Catalog Edition", editions, index=editions.index(DEFAULT_EDITION) if DEFAULT_EDITION in editions else 0)
+    with use_edition(edition) as catalog:
+        st.sidebar.caption(f"{catalog.title} (version {catalog.version})")
+        if page == "Wall Schedule":
+            render_schedule_page()
+        elif page == "Pour Sequence":
+            render_pour_page()
         else:
-            st.success(message)
-
-    # Generate and offer PDF download
-    pdf_data = generate_pdf_report(brace_type, height, pressure, result, validation_messages, project_number, project_name)
-    if pdf_data:
-        st.download_button(
-            label="Download PDF Report",
-            data=pdf_data,
-            file_name=f"PERI_Brace_Frame_Calculation_Report_{project_name.replace(' ', '_')}.pdf",
-            mime="application/pdf"
-        )
+            render_single_page()
+finally:
+    if timer is not None:
+        log_rerun(timer.finish(timing_token, page=page))
 
 # Sidebar notes
 st.sidebar.markdown("---")
@@ -571,3 +385,7 @@ st.sidebar.write("- Values are interpolated if not exact matches.")
 st.sidebar.write("- Ensure inputs are within the supported ranges for each brace type.")
 st.sidebar.write("- All values refer to a width of influence of 1.00 m unless otherwise specified.")
 st.sidebar.write("- Final values are calculated by multiplying loads and deflection by the permissible width of influence (e).")
+
+st.sidebar.checkbox("Show Stage Timings", key="show_timings")
+if timer is not None and st.session_state["show_timings"]:
+    render_timing_panel(timer)
@@ -0,0 +1,80 @@
+"""PERI brace frame load calculator: catalog, interpolation, validation and reports.
+
+Names are resolved from their submodules on first access, so importing the
+calculator does not pull in NumPy, ReportLab or Streamlit until they are needed.
+"""
+import importlib
+
+_EXPORTS = {
+    "brace_frame_data": "catalog",
+    "DATA_VERSION": "catalog",
+    "Catalog": "catalog",
+    "CatalogError": "catalog",
+    "available_editions": "catalog",
+    "load_catalog": "catalog",
+    "current_catalog": "catalog",
+    "use_edition": "catalog",
+    "LOAD_KEYS": "loads",
+    "FINAL_KEYS": "loads",
+    "LoadStatus": "loads",
+    "LoadResult": "loads",
+    "interpolate_value": "loads",
+    "get_loads": "loads",
+    "LOAD_DTYPE": "grid",
+    "RESULT_DTYPE": "grid",
+    "load_status": "grid",
+    "load_results": "grid",
+    "brace_frame_grids": "grid",
+    "get_loads_batch": "grid",
+    "interpolate_grid": "grid",
+    "get_loads_all_types": "grid",
+    "build_lookup_table": "lookup",
+    "load_lookup_table": "lookup",
+    "lookup_loads": "lookup",
+    "validate_bracing": "validation",
+    "read_schedule_chunks": "schedule",
+    "compute_schedule": "schedule",
+    "concat_schedule": "schedule",
+    "schedule_to_csv": "schedule",
+    "schedule_to_json": "schedule",
+    "build_pdf_elements": "report",
+    "generate_pdf_report": "report",
+    "generate_project_report": "report",
+    "load_logo": "report",
+    "prefetch_logo": "report",
+    "export_segment_reports": "export",
+    "export_segment_zip": "export",
+    "OBJECTIVES": "optimizer",
+    "select_brace_types": "optimizer",
+    "rank_brace_types": "optimizer",
+    "evaluate_queries": "service",
+    "evaluate_columns": "service",
+    "ResultCache": "cache",
+    "cached_calculation": "cache",
+    "cached_pdf_report": "cache",
+    "cache_stats": "cache",
+    "load_surface": "plots",
+    "load_surface_png": "plots",
+    "INTERPOLATION_MODES": "interpolators",
+    "get_interpolator": "interpolators",
+    "interpolate_loads": "interpolators",
+    "max_height": "inverse",
+    "max_pressure": "inverse",
+    "pour_stages": "pour",
+    "pour_sequence": "pour",
+    "requirement_changes": "pour",
+    "JobQueue": "jobs",
+    "report_jobs": "jobs",
+    "StageTimer": "timing",
+    "stage": "timing",
+}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
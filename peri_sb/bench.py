@@ -0,0 +1,244 @@
+"""Benchmarks for the load lookup, validation, PDF rendering and batch paths.
+
+Run with ``python -m peri_sb.bench``. Every benchmark is timed with a
+calibrated number of calls per repeat; the median and minimum time per call
+and the item throughput are written to a JSON file. With ``--baseline`` the
+results are compared against a stored run and regressions beyond
+``--tolerance`` are flagged (``--check`` makes them fail the run);
+``--save-baseline`` stores the current run as the baseline.
+
+The logo is stubbed out for the PDF benchmarks, so no file or network access
+is timed.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from unittest import mock
+
+import numpy as np
+
+from . import report
+from .catalog import current_catalog
+from .grid import get_loads_batch
+from .interpolators import INTERPOLATION_MODES, interpolate_loads
+from .loads import get_loads
+from .lookup import lookup_loads
+from .schedule import compute_schedule, concat_schedule, read_schedule_chunks, schedule_to_csv
+from .validation import validate_bracing, validate_bracing_batch
+
+DEFAULT_OUTPUT = "bench_results.json"
+DEFAULT_REPEAT = 5
+# Calls per repeat are raised until one repeat takes at least this long
+MIN_REPEAT_TIME = 0.2
+# Relative slowdown against the baseline that counts as a regression
+DEFAULT_TOLERANCE = 0.25
+BATCH_ROWS = 20000
+
+def measure(fn, items=1, repeat=DEFAULT_REPEAT, min_time=MIN_REPEAT_TIME):
+    """Time fn() and return the median and minimum time per call and items per second."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    times = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+    median = statistics.median(times)
+    return {
+        "median_s": median,
+        "min_s": min(times),
+        "calls": number,
+        "repeat": repeat,
+        "items": items,
+        "items_per_s": items / median,
+    }
+
+def catalog_points(brace_type):
+    """Query points for one type: exact catalog points, one-axis and bilinear midpoints.
+
+    Only points whose neighbouring catalog entries all exist are used, so every
+    point is calculable.
+    """
+    entry = current_catalog().data[brace_type]
+    data = entry["data"]
+    heights = entry["heights"]
+    pressures = entry["pressures"]
+    exact, one_axis, bilinear = [], [], []
+    for h in heights:
+        for p in pressures:
+            if p in data.get(h, {}):
+                exact.append((h, p))
+    for h0, h1 in zip(heights, heights[1:]):
+        for p0, p1 in zip(pressures, pressures[1:]):
+            corners = [p0 in data.get(h0, {}), p1 in data.get(h0, {}), p0 in data.get(h1, {}), p1 in data.get(h1, {})]
+            if corners[0] and corners[1]:
+                one_axis.append((h0, (p0 + p1) / 2))
+            if corners[0] and corners[2]:
+                one_axis.append(((h0 + h1) / 2, p0))
+            if all(corners):
+                bilinear.append(((h0 + h1) / 2, (p0 + p1) / 2))
+    return {"exact": exact, "one_axis": one_axis, "bilinear": bilinear}
+
+def bench_get_loads(repeat):
+    results = {}
+    for brace_type in current_catalog().brace_types:
+        for case, points in catalog_points(brace_type).items():
+            def run(points=points, brace_type=brace_type):
+                for h, p in points:
+                    get_loads(brace_type, h, p)
+            results[f"get_loads/{brace_type}/{case}"] = measure(run, len(points), repeat)
+    return results
+
+def bench_validate_bracing(repeat):
+    cases = [(brace_type, h, e)
+             for brace_type in current_catalog().brace_types + ["SB-X"]
+             for h in np.arange(2.5, 8.76, 0.25).tolist()
+             for e in [0.9, 1.0, 1.25, 1.5, 2.0, 2.25]]
+    def run():
+        for brace_type, h, e in cases:
+            validate_bracing(brace_type, h, e)
+    brace_types, heights, widths = (np.array(column, dtype=object if i == 0 else np.float64) for i, column in enumerate(zip(*cases)))
+    return {
+        "validate_bracing": measure(run, len(cases), repeat),
+        "validate_bracing_batch": measure(lambda: validate_bracing_batch(brace_types, heights, widths), len(cases), repeat),
+    }
+
+def bench_batch_lookup(repeat):
+    rng = np.random.default_rng(0)
+    heights = np.round(rng.uniform(2.5, 8.75, 100000), 2)
+    pressures = rng.integers(30, 61, 100000).astype(np.float64)
+    lookup_loads("SB-2", heights[:1], pressures[:1])
+    results = {
+        "get_loads_batch/SB-2": measure(lambda: get_loads_batch("SB-2", heights, pressures), len(heights), repeat),
+        "lookup_loads/SB-2": measure(lambda: lookup_loads("SB-2", heights, pressures), len(heights), repeat),
+    }
+    for mode in INTERPOLATION_MODES:
+        results[f"interpolate_loads/SB-2/{mode}"] = measure(lambda mode=mode: interpolate_loads("SB-2", heights, pressures, mode), len(heights), repeat)
+    return results
+
+def bench_pdf(repeat):
+    brace_type, height, pressure = "SB-2", 5.5, 40.0
+    result = get_loads(brace_type, height, pressure)
+    messages = validate_bracing(brace_type, height, result.e)
+    args = (brace_type, height, pressure, result, messages, "P-001", "Benchmark Project")
+    with mock.patch.object(report, "load_logo", return_value=None):
+        return {
+            "build_pdf_elements": measure(lambda: report.build_pdf_elements(*args), 1, repeat),
+            "generate_pdf_report": measure(lambda: report.generate_pdf_report(*args), 1, repeat),
+        }
+
+def synthetic_schedule(rows=BATCH_ROWS, seed=0):
+    """CSV lines of a wall schedule with random types, heights, pressures and lengths."""
+    rng = np.random.default_rng(seed)
+    brace_types = current_catalog().brace_types
+    lines = ["id,brace_type,height,pressure,length"]
+    for i in range(rows):
+        lines.append(f"W{i},{brace_types[rng.integers(len(brace_types))]},{rng.uniform(2.5, 8.75):.2f},{rng.integers(30, 61)},{rng.uniform(1, 20):.2f}")
+    return lines
+
+def bench_end_to_end(repeat):
+    lines = synthetic_schedule()
+    def run():
+        schedule_to_csv(concat_schedule([compute_schedule(chunk) for chunk in read_schedule_chunks(lines)]))
+    return {"schedule_end_to_end": measure(run, len(lines) - 1, repeat)}
+
+BENCHMARKS = {
+    "get_loads": bench_get_loads,
+    "validate_bracing": bench_validate_bracing,
+    "batch_lookup": bench_batch_lookup,
+    "pdf": bench_pdf,
+    "end_to_end": bench_end_to_end,
+}
+
+def run_benchmarks(groups=None, repeat=DEFAULT_REPEAT):
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if groups is None or name in groups:
+            results.update(bench(repeat))
+    return results
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Median time ratio per benchmark against a baseline run; ratio > 1 is slower."""
+    comparison = {}
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        ratio = current["median_s"] / previous["median_s"]
+        comparison[name] = {
+            "baseline_s": previous["median_s"],
+            "current_s": current["median_s"],
+            "ratio": ratio,
+            "regression": ratio > 1 + tolerance,
+        }
+    return comparison
+
+def environment():
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "catalog_edition": current_catalog().edition,
+        "data_version": current_catalog().version,
+        "program_version": report.PROGRAM_VERSION,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the PERI brace frame calculator.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON results file (default: %(default)s)")
+    parser.add_argument("--baseline", help="stored results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="also write the results to --baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="relative slowdown counted as a regression (default: %(default)s)")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 if any benchmark regressed")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="run only these benchmark groups")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    args = parser.parse_args(argv)
+    if args.save_baseline and not args.baseline:
+        parser.error("--save-baseline requires --baseline")
+    if args.check:
+        # Without a baseline to compare against, --check would pass every run
+        if not args.baseline or args.save_baseline:
+            parser.error("--check requires --baseline without --save-baseline")
+        if not os.path.exists(args.baseline):
+            parser.error(f"baseline {args.baseline} does not exist")
+
+    run = {"environment": environment(), "results": run_benchmarks(args.only, args.repeat)}
+    if args.baseline and os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            run["baseline"] = args.baseline
+            run["comparison"] = compare(run["results"], json.load(f), args.tolerance)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(run, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+
+    comparison = run.get("comparison", {})
+    for name, result in run["results"].items():
+        line = f"{name:<40} {1e6 * result['median_s']:>12.1f} µs/call {result['items_per_s']:>14,.0f} items/s"
+        if name in comparison:
+            line += f"  x{comparison[name]['ratio']:.2f}" + ("  REGRESSION" if comparison[name]["regression"] else "")
+        print(line)
+    regressions = [name for name, entry in comparison.items() if entry["regression"]]
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+    return 1 if args.check and regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Process-wide result cache shared by every session of the app.
+
+Calculations and rendered PDF reports are keyed on the normalized inputs and
+the catalog version. Both caches are bounded (least recently used entries are
+evicted first); PDF reports also expire after PDF_CACHE_TTL seconds. Cached
+values are shared between sessions and must be treated as read-only.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from .catalog import current_catalog
+from .loads import get_loads
+from .plots import load_surface_png
+from .report import generate_pdf_report
+from .timing import stage
+from .validation import validate_bracing
+
+CALCULATION_CACHE_SIZE = 4096
+PDF_CACHE_SIZE = 32
+# Seconds a rendered PDF is kept; 0 keeps it until evicted
+PDF_CACHE_TTL = float(os.environ.get("PERI_SB_PDF_CACHE_TTL", "3600"))
+
+class ResultCache:
+    """Thread-safe LRU cache with optional TTL and hit, miss and eviction counters.
+
+    Values are computed outside the lock, so two threads missing the same key
+    at once both compute it and the second result is kept.
+    """
+    def __init__(self, max_entries, ttl=None, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl or None
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, key, compute):
+        """Cached value for key, calling compute() and storing its result on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires is None or expires > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._entries[key] = (None if self.ttl is None else self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def get(self, key):
+        """Cached value for key, or None; only a hit is counted, a miss is left to the get_or_compute that follows."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires is not None and expires <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else None,
+            }
+
+calculation_cache = ResultCache(CALCULATION_CACHE_SIZE)
+pdf_cache = ResultCache(PDF_CACHE_SIZE, ttl=PDF_CACHE_TTL)
+
+def calculation_key(brace_type, height, pressure):
+    """Inputs at the app's resolution (0.01 m, 0.01 kN/m²) plus the catalog version."""
+    return (str(brace_type), round(float(height), 2), round(float(pressure), 2), current_catalog().version)
+
+def cached_calculation(brace_type, height, pressure):
+    """get_loads and validate_bracing for one input; messages are None unless the loads could be calculated.
+
+    Each is timed as its own stage on a miss.
+    """
+    key = calculation_key(brace_type, height, pressure)
+
+    def compute():
+        with stage("get_loads"):
+            result = get_loads(*key[:3])
+        if not result.ok:
+            return result, None
+        with stage("validate_bracing"):
+            return result, validate_bracing(key[0], key[1], result.e)
+
+    return calculation_cache.get_or_compute(key, compute)
+
+def pdf_report_key(brace_type, height, pressure, project_number, project_name, report_date, include_surfaces=False):
+    """calculation_key plus the report fields; report_date is only part of the key, so each day gets a fresh report."""
+    return calculation_key(brace_type, height, pressure) + (project_number, project_name, report_date, include_surfaces)
+
+def rendered_pdf_report(*args, **kwargs):
+    """Cached PDF report bytes for the pdf_report_key arguments, or None if not rendered (or expired)."""
+    return pdf_cache.get(pdf_report_key(*args, **kwargs))
+
+def cached_pdf_report(brace_type, height, pressure, project_number, project_name, report_date, include_surfaces=False):
+    """PDF report bytes for one input, rendered on a miss."""
+    key = pdf_report_key(brace_type, height, pressure, project_number, project_name, report_date, include_surfaces)
+
+    def compute():
+        result, messages = cached_calculation(brace_type, height, pressure)
+        surface_png = load_surface_png(*key[:3]) if include_surfaces else None
+        return generate_pdf_report(key[0], key[1], key[2], result, messages, project_number, project_name, surface_png)
+
+    return pdf_cache.get_or_compute(key, compute)
+
+def prerender_pdf_report(*args, **kwargs):
+    """cached_pdf_report for a background job: returns only the size, so the bytes are kept by the PDF cache alone."""
+    return len(cached_pdf_report(*args, **kwargs))
+
+def cache_stats():
+    return {"calculation": calculation_cache.stats(), "pdf": pdf_cache.stats()}
@@ -0,0 +1,180 @@
+"""PERI SB brace frame catalog: loads per metre of wall by height and fresh concrete pressure.
+
+The load tables are versioned JSON files, one per catalog edition, in
+CATALOG_DIR (``peri_sb/catalogs`` unless PERI_SB_CATALOG_DIR is set). Each file
+holds, per brace type, the sorted heights and pressures and one
+height x pressure table per load field, with null where the catalog has no
+value. An edition is read and schema-validated once per process, on first
+use, and kept as arrays; the nested dict form used by get_loads is built only
+when it is first needed. Catalog.version is a hash of the edition's content
+and keys every cache derived from it.
+
+Several editions can be loaded side by side. The edition in use is tracked
+per context: use_edition() switches it for the enclosed block (the app does
+this per rerun, so each session can use its own edition) and
+current_catalog() returns it. brace_frame_data and DATA_VERSION are the
+current edition's dict and version.
+"""
+import contextlib
+import functools
+import hashlib
+import json
+import os
+from contextvars import ContextVar
+
+CATALOG_FORMAT = "peri-sb-catalog"
+CATALOG_SCHEMA_VERSION = 1
+CATALOG_DIR = os.environ.get("PERI_SB_CATALOG_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalogs")
+DEFAULT_EDITION = os.environ.get("PERI_SB_CATALOG_EDITION", "2025")
+LOAD_KEYS = ["e", "Z", "V1", "V2", "f"]
+
+class CatalogError(ValueError):
+    """A catalog edition is missing or does not match the catalog schema."""
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _check_axis(values, name, where):
+    if not isinstance(values, list) or len(values) < 2 or not all(_is_number(v) and v > 0 for v in values):
+        raise CatalogError(f"{where}: {name} must be a list of at least two positive numbers.")
+    if any(b <= a for a, b in zip(values, values[1:])):
+        raise CatalogError(f"{where}: {name} must be strictly increasing.")
+
+def validate_catalog(document, source="catalog"):
+    """Raise CatalogError unless document is a valid catalog edition."""
+    if not isinstance(document, dict) or document.get("format") != CATALOG_FORMAT:
+        raise CatalogError(f"{source}: not a {CATALOG_FORMAT} file.")
+    if document.get("schema_version") != CATALOG_SCHEMA_VERSION:
+        raise CatalogError(f"{source}: unsupported schema_version {document.get('schema_version')!r}; expected {CATALOG_SCHEMA_VERSION}.")
+    if not isinstance(document.get("edition"), str) or not document["edition"]:
+        raise CatalogError(f"{source}: edition must be a non-empty string.")
+    if document.get("fields") != LOAD_KEYS:
+        raise CatalogError(f"{source}: fields must be {LOAD_KEYS}.")
+    brace_types = document.get("brace_types")
+    if not isinstance(brace_types, dict) or not brace_types:
+        raise CatalogError(f"{source}: brace_types must be a non-empty object.")
+
+    for brace_type, entry in brace_types.items():
+        where = f"{source}: {brace_type}"
+        if not isinstance(entry, dict):
+            raise CatalogError(f"{where}: entry must be an object.")
+        _check_axis(entry.get("heights"), "heights", where)
+        _check_axis(entry.get("pressures"), "pressures", where)
+        values = entry.get("values")
+        if not isinstance(values, dict) or sorted(values) != sorted(LOAD_KEYS):
+            raise CatalogError(f"{where}: values must have exactly the fields {LOAD_KEYS}.")
+        shape = (len(entry["heights"]), len(entry["pressures"]))
+        gaps = None
+        for key in LOAD_KEYS:
+            table = values[key]
+            if not isinstance(table, list) or len(table) != shape[0] or not all(isinstance(row, list) and len(row) == shape[1] for row in table):
+                raise CatalogError(f"{where}: {key} must be a {shape[0]} x {shape[1]} table (heights x pressures).")
+            if not all(value is None or _is_number(value) for row in table for value in row):
+                raise CatalogError(f"{where}: {key} values must be numbers or null.")
+            missing = [[value is None for value in row] for row in table]
+            if gaps is None:
+                gaps = missing
+            elif missing != gaps:
+                raise CatalogError(f"{where}: {key} has gaps in different places than {LOAD_KEYS[0]}.")
+        if not any(value is not None for row in values["e"] for value in row):
+            raise CatalogError(f"{where}: the table has no values.")
+        if any(value is not None and value <= 0 for row in values["e"] for value in row):
+            raise CatalogError(f"{where}: e must be positive.")
+
+class Catalog:
+    """One validated catalog edition."""
+    def __init__(self, document, version):
+        self.edition = document["edition"]
+        self.title = document.get("title", self.edition)
+        self.version = version
+        self.brace_types = list(document["brace_types"])
+        self._document = document
+
+    def __repr__(self):
+        return f"Catalog(edition={self.edition!r}, version={self.version!r})"
+
+    def ranges(self, brace_type):
+        """(heights, pressures) lists of a brace type as given in the catalog."""
+        entry = self._document["brace_types"][brace_type]
+        return entry["heights"], entry["pressures"]
+
+    @functools.cached_property
+    def grids(self):
+        """Per brace type: heights and pressures arrays and a (heights, pressures, fields) value array, NaN at gaps."""
+        # Imported here so the scalar get_loads path does not load NumPy
+        import numpy as np
+
+        grids = {}
+        for brace_type, entry in self._document["brace_types"].items():
+            values = np.array([entry["values"][key] for key in LOAD_KEYS], dtype=np.float64)
+            grids[brace_type] = {
+                "heights": np.array(entry["heights"], dtype=np.float64),
+                "pressures": np.array(entry["pressures"], dtype=np.float64),
+                "values": np.moveaxis(values, 0, -1),
+            }
+        return grids
+
+    @functools.cached_property
+    def data(self):
+        """Nested dict form: brace type -> heights, pressures and data[height][pressure][field]."""
+        data = {}
+        for brace_type, entry in self._document["brace_types"].items():
+            rows = {}
+            for i, h in enumerate(entry["heights"]):
+                row = {}
+                for j, p in enumerate(entry["pressures"]):
+                    if entry["values"]["e"][i][j] is not None:
+                        row[p] = {key: entry["values"][key][i][j] for key in LOAD_KEYS}
+                if row:
+                    rows[h] = row
+            data[brace_type] = {"heights": list(entry["heights"]), "pressures": list(entry["pressures"]), "data": rows}
+        return data
+
+def catalog_path(edition):
+    return os.path.join(CATALOG_DIR, f"{edition}.json")
+
+def available_editions():
+    """Names of the catalog editions in CATALOG_DIR, sorted."""
+    try:
+        names = os.listdir(CATALOG_DIR)
+    except FileNotFoundError:
+        return []
+    return sorted(name[:-len(".json")] for name in names if name.endswith(".json"))
+
+@functools.lru_cache(maxsize=None)
+def load_catalog(edition=DEFAULT_EDITION):
+    """Read and validate a catalog edition; each edition is loaded once per process."""
+    path = catalog_path(edition)
+    try:
+        with open(path, encoding="utf-8") as f:
+            document = json.load(f)
+    except FileNotFoundError:
+        raise CatalogError(f"Catalog edition {edition!r} not found in {CATALOG_DIR}.") from None
+    except json.JSONDecodeError as exc:
+        raise CatalogError(f"{path}: invalid JSON ({exc}).") from None
+    validate_catalog(document, path)
+    canonical = json.dumps(document, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return Catalog(document, hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12])
+
+_current_edition = ContextVar("peri_sb_catalog_edition", default=None)
+
+def current_catalog():
+    """The catalog edition in use in this context (DEFAULT_EDITION unless use_edition is active)."""
+    return load_catalog(_current_edition.get() or DEFAULT_EDITION)
+
+@contextlib.contextmanager
+def use_edition(edition):
+    """Use the given catalog edition for the enclosed block; yields its Catalog."""
+    catalog = load_catalog(edition)
+    token = _current_edition.set(edition)
+    try:
+        yield catalog
+    finally:
+        _current_edition.reset(token)
+
+def __getattr__(name):
+    if name == "brace_frame_data":
+        return current_catalog().data
+    if name == "DATA_VERSION":
+        return current_catalog().version
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
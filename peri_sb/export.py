@@ -0,0 +1,153 @@
+"""Bulk export: one PDF per segment, rendered in parallel and written to a ZIP.
+
+All exports of a process share one pool of EXPORT_WORKERS render processes,
+started on first use, so concurrent exports never run more renders than the
+report job queue allows. The pool starts its processes with forkserver (spawn
+where that is not available): exports run in job threads of a multi-threaded
+server, and a forked child could inherit a lock held by another thread.
+
+ZIP files are written to the temporary directory; files older than
+ZIP_MAX_AGE seconds are removed whenever a new export starts, so ZIPs of
+sessions that ended are not kept forever.
+"""
+import glob
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from .jobs import REPORT_WORKERS
+from .loads import LOAD_KEYS, LoadResult
+from .report import generate_pdf_report
+from .schedule import SCHEDULE_RESULT_COLUMNS
+from .validation import validate_bracing
+
+EXPORT_WORKERS = REPORT_WORKERS
+ZIP_PREFIX = "peri_sb_segments_"
+# Seconds an exported ZIP is kept for download
+ZIP_MAX_AGE = float(os.environ.get("PERI_SB_ZIP_MAX_AGE", "21600"))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def render_pool():
+    """The process-wide pool of render processes."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(max_workers=EXPORT_WORKERS, mp_context=multiprocessing.get_context(method))
+        return _pool
+
+def _discard_pool(pool):
+    """Forget a broken pool, so the next export starts a new one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def render_segment_pdf(segment, project_number, project_name):
+    """Full single-segment report for one schedule row; runs in a worker process."""
+    brace_type, height, pressure = segment["brace_type"], segment["height"], segment["pressure"]
+    result = LoadResult(brace_type, height, pressure, *(segment[key] for key in LOAD_KEYS))
+    validation_messages = validate_bracing(brace_type, height, result.e)
+    return generate_pdf_report(brace_type, height, pressure, result, validation_messages, project_number, project_name)
+
+def export_segment_reports(results, project_number, project_name, zip_file, workers=EXPORT_WORKERS, on_progress=None, render_slots=None):
+    """Render a PDF per calculated segment in the render pool and write each into zip_file as it finishes.
+
+    At most `workers` PDFs are in flight at a time. If render_slots (a
+    semaphore) is given, a slot is also held for every PDF in flight.
+    on_progress(done, total) is called after every PDF; returning False
+    cancels the remaining segments. Returns the number of PDFs written.
+    """
+    rows = np.flatnonzero(results["status"] == "OK")
+    total = len(rows)
+    done = 0
+    pool = render_pool()
+    pending = {}
+    try:
+        with zipfile.ZipFile(zip_file, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            position = 0
+            while True:
+                while position < total and len(pending) < workers:
+                    # Only wait for a slot with nothing in flight; otherwise collect a finished PDF first,
+                    # so exports never wait on each other while holding slots
+                    if render_slots is not None and not render_slots.acquire(blocking=not pending):
+                        break
+                    i = rows[position]
+                    position += 1
+                    segment = {column: results[column][i] for column in SCHEDULE_RESULT_COLUMNS}
+                    file_name = f"{i + 1:05d}_{re.sub(r'[^A-Za-z0-9_.-]+', '_', str(segment['id']))}.pdf"
+                    try:
+                        pending[pool.submit(render_segment_pdf, segment, project_number, project_name)] = file_name
+                    except BaseException:
+                        if render_slots is not None:
+                            render_slots.release()
+                        raise
+                if not pending:
+                    break
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    file_name = pending.pop(future)
+                    if render_slots is not None:
+                        render_slots.release()
+                    archive.writestr(file_name, future.result())
+                    done += 1
+                if on_progress is not None and on_progress(done, total) is False:
+                    break
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        raise
+    finally:
+        # The pool is shared: drop what has not started and wait for the renders still running
+        for future in pending:
+            future.cancel()
+        wait(pending)
+        if render_slots is not None:
+            for _ in pending:
+                render_slots.release()
+    return done
+
+def export_segment_zip(results, project_number, project_name, workers=EXPORT_WORKERS, on_progress=None, render_slots=None):
+    """export_segment_reports into a new temporary ZIP file; returns its path and the number of PDFs.
+
+    The file is removed again if the export fails or is cancelled by an
+    exception from on_progress, and otherwise by the first export that starts
+    after ZIP_MAX_AGE seconds.
+    """
+    sweep_segment_zips()
+    fd, zip_path = tempfile.mkstemp(prefix=ZIP_PREFIX, suffix=".zip")
+    try:
+        with os.fdopen(fd, "wb") as zip_file:
+            count = export_segment_reports(results, project_number, project_name, zip_file, workers, on_progress, render_slots)
+    except BaseException:
+        os.remove(zip_path)
+        raise
+    return zip_path, count
+
+def sweep_segment_zips(max_age=ZIP_MAX_AGE):
+    """Remove exported ZIPs older than max_age seconds from the temporary directory."""
+    cutoff = time.time() - max_age
+    for zip_path in glob.glob(os.path.join(tempfile.gettempdir(), f"{ZIP_PREFIX}*.zip")):
+        try:
+            if os.path.getmtime(zip_path) < cutoff:
+                os.remove(zip_path)
+        except OSError:
+            pass
+
+def discard_segment_zip(result):
+    """Remove the file of an export_segment_zip result that nobody fetched."""
+    zip_path, _ = result
+    try:
+        os.remove(zip_path)
+    except OSError:
+        pass
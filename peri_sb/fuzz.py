@@ -0,0 +1,373 @@
+"""Differential fuzzing of the batch load engines against the scalar get_loads.
+
+Run with ``python -m peri_sb.fuzz``. For every brace type the harness builds
+edge-case inputs (catalog points of every type, their neighbours one ulp
+away, midpoints, the app's 0.01 m / 1 kN/m² input grid across and just
+beyond the range, non-finite values) and ``--points`` random inputs, computes
+get_loads for each of them as the reference and checks every engine in
+ENGINES against it:
+
+- where the reference returns loads, the engine must be valid and within
+  ``atol + rtol * |reference|`` for every field;
+- where the reference returns an error status (catalog gaps, out of range,
+  non-finite input), the engine must be invalid, and load_error must give the
+  reference's message;
+- load_status on the engine's valid mask must give the reference's status.
+
+The service's JSON encoder is checked on a sample of the points and on
+numbers across its digit tables: its output, decoded with every number kept
+as text, must equal json.dumps of evaluate_queries and evaluate_columns, so a
+change to OUTPUT_DECIMALS or the tables that writes 48 for 48.0 fails the run.
+
+pchip mode has no get_loads counterpart. Next to catalog gaps it is checked
+against pchip_reference, a per-point spline over the existing catalog points
+of the stencil only, so a result that depends on gap cells fails the run.
+
+The worst deviation per engine and type, the mismatch counts and the
+throughput of each engine relative to get_loads are printed and written to a
+JSON file; ``--check`` exits with status 1 on any failure, so the run can be
+used as a regression gate.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.interpolate import PchipInterpolator
+
+from .bench import environment
+from .catalog import DEFAULT_EDITION, current_catalog, use_edition
+from .grid import get_loads_all_types, get_loads_batch, load_error, load_status
+from .interpolators import interpolate_loads
+from .loads import LOAD_KEYS, LoadStatus, get_loads
+from .lookup import HEIGHT_STEP, PRESSURE_STEP, lookup_loads
+from .service import OUTPUT_DECIMALS, _array_bytes, _columns_fields, _dumps, _number_bytes, _object_bytes, _queries_json, evaluate_columns, evaluate_queries
+
+DEFAULT_OUTPUT = "fuzz_results.json"
+DEFAULT_POINTS = 1_000_000
+DEFAULT_ATOL = 1e-9
+DEFAULT_RTOL = 1e-9
+FUZZ_WORKERS = os.cpu_count() or 1
+# Reference points per worker task
+REFERENCE_CHUNK = 100_000
+# Fraction of the range added on each side of the random inputs, so out-of-range inputs are covered
+RANDOM_MARGIN = 0.05
+# Points next to catalog gaps checked against pchip_reference per brace type
+PCHIP_GAP_POINTS = 2000
+# Points per brace type sent through the service's JSON encoder
+SERVICE_JSON_POINTS = 5000
+
+def _all_types_engine(brace_type, heights, pressures):
+    brace_types, loads = get_loads_all_types(heights, pressures)
+    return loads[brace_types.index(brace_type)]
+
+# Engine name: fn(brace_type, heights, pressures) returning a LOAD_DTYPE array
+ENGINES = {
+    "get_loads_batch": get_loads_batch,
+    "lookup_loads": lookup_loads,
+    "interpolate_loads/linear": lambda brace_type, heights, pressures: interpolate_loads(brace_type, heights, pressures, "linear"),
+    "get_loads_all_types": _all_types_engine,
+}
+
+def _neighbours(values):
+    """Values, their midpoints and the floats one ulp below and above each."""
+    values = np.unique(np.asarray(values, dtype=np.float64))
+    return np.unique(np.concatenate([values, (values[1:] + values[:-1]) / 2, np.nextafter(values, -np.inf), np.nextafter(values, np.inf)]))
+
+def _app_grid(low, high, step, margin):
+    """The app's input grid from margin steps below low to margin steps above high."""
+    return np.round(np.arange(round(low / step) - margin, round(high / step) + margin + 1) * step, 10)
+
+def edge_points(brace_type):
+    """Edge-case (heights, pressures) for one brace type: every combination of the edge values per axis."""
+    catalog = current_catalog()
+    heights, pressures = catalog.ranges(brace_type)
+    all_heights = [h for name in catalog.brace_types for h in catalog.ranges(name)[0]]
+    all_pressures = [p for name in catalog.brace_types for p in catalog.ranges(name)[1]]
+    special = [np.nan, np.inf, -np.inf, 0.0]
+    h_edges = np.unique(np.concatenate([_neighbours(all_heights), _app_grid(heights[0], heights[-1], HEIGHT_STEP, 5)]))
+    p_edges = np.unique(np.concatenate([_neighbours(all_pressures), _app_grid(pressures[0], pressures[-1], PRESSURE_STEP, 2)]))
+    h_edges, p_edges = np.concatenate([h_edges, special]), np.concatenate([p_edges, special])
+    h, p = np.meshgrid(h_edges, p_edges, indexing="ij")
+    return h.ravel(), p.ravel()
+
+def random_points(brace_type, count, rng):
+    """Random (heights, pressures) over the type's range plus margins: half continuous, half on the app's input grid."""
+    heights, pressures = current_catalog().ranges(brace_type)
+    h_margin = RANDOM_MARGIN * (heights[-1] - heights[0])
+    p_margin = RANDOM_MARGIN * (pressures[-1] - pressures[0])
+    h = rng.uniform(heights[0] - h_margin, heights[-1] + h_margin, count)
+    p = rng.uniform(pressures[0] - p_margin, pressures[-1] + p_margin, count)
+    snapped = slice(count // 2, None)
+    h[snapped] = np.round(np.round(h[snapped] / HEIGHT_STEP) * HEIGHT_STEP, 2)
+    p[snapped] = np.round(p[snapped] / PRESSURE_STEP) * PRESSURE_STEP
+    return h, p
+
+def reference_chunk(edition, brace_type, heights, pressures):
+    """get_loads at each point: (loads array with NaN where no loads, status codes, error messages or None, seconds).
+
+    Runs in a worker process for large runs.
+    """
+    loads = np.full((len(heights), len(LOAD_KEYS)), np.nan)
+    status = np.zeros(len(heights), dtype=np.int8)
+    errors = [None] * len(heights)
+    with use_edition(edition):
+        start = time.perf_counter()
+        for i, (h, p) in enumerate(zip(heights.tolist(), pressures.tolist())):
+            result = get_loads(brace_type, h, p)
+            if result.ok:
+                loads[i] = [getattr(result, key) for key in LOAD_KEYS]
+            else:
+                status[i] = result.status
+                errors[i] = result.message
+        elapsed = time.perf_counter() - start
+    return loads, status, errors, elapsed
+
+def reference(brace_type, heights, pressures, workers=FUZZ_WORKERS):
+    """reference_chunk over all points, split across worker processes if workers > 1."""
+    edition = current_catalog().edition
+    bounds = range(0, len(heights), REFERENCE_CHUNK)
+    if workers <= 1 or len(heights) <= REFERENCE_CHUNK:
+        chunks = [reference_chunk(edition, brace_type, heights[i:i + REFERENCE_CHUNK], pressures[i:i + REFERENCE_CHUNK]) for i in bounds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(reference_chunk, [edition] * len(bounds), [brace_type] * len(bounds),
+                                   [heights[i:i + REFERENCE_CHUNK] for i in bounds], [pressures[i:i + REFERENCE_CHUNK] for i in bounds]))
+    loads = np.concatenate([chunk[0] for chunk in chunks])
+    status = np.concatenate([chunk[1] for chunk in chunks])
+    errors = [error for chunk in chunks for error in chunk[2]]
+    return loads, status, errors, sum(chunk[3] for chunk in chunks)
+
+def _example(heights, pressures, rows):
+    return [{"height": float(heights[i]), "pressure": float(pressures[i])} for i in rows[:5].tolist()]
+
+def compare(reference_loads, has_loads, result, heights, pressures, atol=DEFAULT_ATOL, rtol=DEFAULT_RTOL):
+    """Mismatch counts, worst deviation and failing examples of one engine result against the reference."""
+    valid = result["valid"]
+    both = has_loads & valid
+    missing = np.flatnonzero(has_loads & ~valid)
+    spurious = np.flatnonzero(~has_loads & valid)
+    values = np.stack([result[key] for key in LOAD_KEYS], axis=-1)[both]
+    expected = reference_loads[both]
+    deviation = np.abs(values - expected)
+    bad = ~(deviation <= atol + rtol * np.abs(expected))
+    out_of_tolerance = np.flatnonzero(both)[bad.any(axis=-1)]
+
+    worst = None
+    if deviation.size:
+        row, k = np.unravel_index(np.argmax(deviation), deviation.shape)
+        i = np.flatnonzero(both)[row]
+        worst = {
+            "field": LOAD_KEYS[k],
+            "abs": float(deviation[row, k]),
+            "rel": float(deviation[row, k] / abs(expected[row, k])) if expected[row, k] else (math.inf if deviation[row, k] else 0.0),
+            "height": float(heights[i]),
+            "pressure": float(pressures[i]),
+            "reference": float(expected[row, k]),
+            "value": float(values[row, k]),
+        }
+    return {
+        "compared": int(both.sum()),
+        "exact": int((deviation == 0).all(axis=-1).sum()),
+        "out_of_tolerance": len(out_of_tolerance),
+        "missing": len(missing),
+        "spurious": len(spurious),
+        "worst": worst,
+        "examples": {
+            "out_of_tolerance": _example(heights, pressures, out_of_tolerance),
+            "missing": _example(heights, pressures, missing),
+            "spurious": _example(heights, pressures, spurious),
+        },
+    }
+
+def check_messages(brace_type, heights, pressures, errors):
+    """Points where the reference returned a message that load_error does not reproduce."""
+    rows = [i for i, error in enumerate(errors) if error is not None]
+    mismatched = np.array([i for i in rows if load_error(brace_type, heights[i], pressures[i]) != errors[i]], dtype=np.intp)
+    return {"checked": len(rows), "mismatched": len(mismatched), "examples": _example(heights, pressures, mismatched)}
+
+def _same_json(encoded, expected):
+    """True if encoded is valid JSON equal to expected with every number compared as text, so 48 and 48.0 differ."""
+    try:
+        return json.loads(encoded, parse_float=str, parse_int=str) == json.loads(expected, parse_float=str, parse_int=str)
+    except ValueError:
+        return False
+
+def _service_numbers(rng):
+    """Numbers as the service writes them (rounded to OUTPUT_DECIMALS): around every digit group and decimal boundary, signed zeros and non-finite values."""
+    powers = 10.0 ** np.arange(-OUTPUT_DECIMALS, 13)
+    step = 10.0 ** -OUTPUT_DECIMALS
+    edges = np.concatenate([powers, powers - step, powers - step / 2, powers + step / 2, [0.0, -0.0, np.nan, np.inf, -np.inf]])
+    spread = rng.uniform(0, 1, 10000) * 10.0 ** rng.integers(-OUTPUT_DECIMALS, 13, 10000)
+    values = np.concatenate([edges, -edges, spread, -spread])
+    return np.round(values, OUTPUT_DECIMALS)
+
+def check_service_json(brace_type, heights, pressures, rng):
+    """The service's JSON encoder against json.dumps of the same results; returns the mismatched checks."""
+    sample = rng.choice(len(heights), min(SERVICE_JSON_POINTS, len(heights)), replace=False)
+    heights, pressures = heights[sample], pressures[sample]
+    queries = [{"brace_type": brace_type, "height": h, "pressure": p} for h, p in zip(heights.tolist(), pressures.tolist())]
+    numbers = _service_numbers(rng)
+    integers = np.concatenate([np.arange(1000.0), [np.nan]])
+    checks = {
+        "queries": (_queries_json(queries), _dumps(evaluate_queries(queries))),
+        "columns": (_object_bytes(_columns_fields(brace_type, heights, pressures)), _dumps(evaluate_columns(brace_type, heights, pressures))),
+        "numbers": (_array_bytes(_number_bytes(numbers)), _dumps([value if math.isfinite(value) else None for value in numbers.tolist()])),
+        "integers": (_array_bytes(_number_bytes(integers, integers=True)), _dumps([None if value != value else int(value) for value in integers.tolist()])),
+    }
+    mismatched = [name for name, (encoded, expected) in checks.items() if not _same_json(encoded, expected)]
+    return {"checked": len(checks), "points": len(queries), "numbers": len(numbers), "mismatched": mismatched}
+
+def _adjacent_run(flags, low, high):
+    """First and last index of the run of True flags around low..high."""
+    while low > 0 and flags[low - 1]:
+        low -= 1
+    while high < len(flags) - 1 and flags[high + 1]:
+        high += 1
+    return low, high
+
+def pchip_reference(brace_type, height, pressure):
+    """pchip loads at one covered point, built from the existing catalog points of its stencil only.
+
+    Along pressure, each height row is splined over the run of adjacent
+    existing pressures around the point; along height, over the run of
+    adjacent rows that have such a value.
+    """
+    grid = current_catalog().grids[brace_type]
+    heights, pressures, values = grid["heights"], grid["pressures"], grid["values"]
+    present = ~np.isnan(values[..., 0])
+    h_low, h_high = int(np.searchsorted(heights, height, side="right")) - 1, int(np.searchsorted(heights, height, side="left"))
+    p_low, p_high = int(np.searchsorted(pressures, pressure, side="right")) - 1, int(np.searchsorted(pressures, pressure, side="left"))
+    row_flags = present[:, p_low] & present[:, p_high]
+    first, last = _adjacent_run(row_flags, h_low, h_high)
+    rows = []
+    for i in range(first, last + 1):
+        j0, j1 = _adjacent_run(present[i], p_low, p_high)
+        rows.append(PchipInterpolator(pressures[j0:j1 + 1], values[i, j0:j1 + 1], axis=0)(pressure) if j1 > j0 else values[i, j0])
+    if last == first:
+        return rows[0]
+    return PchipInterpolator(heights[first:last + 1], np.array(rows), axis=0)(height)
+
+def check_pchip_gaps(brace_type, heights, pressures, rng, atol=DEFAULT_ATOL, rtol=DEFAULT_RTOL):
+    """pchip against pchip_reference at up to PCHIP_GAP_POINTS valid points whose stencil borders a gap."""
+    grid = current_catalog().grids[brace_type]
+    present = ~np.isnan(grid["values"][..., 0])
+    result = interpolate_loads(brace_type, heights, pressures, "pchip")
+    if present.all():
+        return {"checked": 0, "out_of_tolerance": 0, "examples": []}
+    # A gap in any row of the point's pressure columns or any column of its height rows
+    p_low = np.clip(np.searchsorted(grid["pressures"], pressures, side="right") - 1, 0, len(grid["pressures"]) - 1)
+    h_low = np.clip(np.searchsorted(grid["heights"], heights, side="right") - 1, 0, len(grid["heights"]) - 1)
+    gap_columns, gap_rows = ~present.all(axis=0), ~present.all(axis=1)
+    near = gap_columns[np.maximum(p_low - 1, 0)] | gap_columns[p_low] | gap_columns[np.minimum(p_low + 1, len(gap_columns) - 1)]
+    near |= gap_rows[np.maximum(h_low - 1, 0)] | gap_rows[h_low] | gap_rows[np.minimum(h_low + 1, len(gap_rows) - 1)]
+    rows = np.flatnonzero(result["valid"] & near)
+    if len(rows) > PCHIP_GAP_POINTS:
+        rows = np.sort(rng.choice(rows, PCHIP_GAP_POINTS, replace=False))
+    values = np.stack([result[key] for key in LOAD_KEYS], axis=-1)[rows]
+    expected = np.array([pchip_reference(brace_type, heights[i], pressures[i]) for i in rows.tolist()]).reshape(values.shape)
+    bad = rows[~(np.abs(values - expected) <= atol + rtol * np.abs(expected)).all(axis=-1)]
+    return {"checked": len(rows), "out_of_tolerance": len(bad), "examples": _example(heights, pressures, bad)}
+
+def fuzz_type(brace_type, engines, points, rng, atol=DEFAULT_ATOL, rtol=DEFAULT_RTOL, workers=FUZZ_WORKERS):
+    """Fuzz every engine on one brace type; returns the per-engine comparisons and the reference stats."""
+    edge_h, edge_p = edge_points(brace_type)
+    random_h, random_p = random_points(brace_type, points, rng)
+    heights, pressures = np.concatenate([edge_h, random_h]), np.concatenate([edge_p, random_p])
+    reference_loads, reference_status, errors, reference_s = reference(brace_type, heights, pressures, workers)
+    has_loads = reference_status == LoadStatus.OK
+
+    results = {}
+    for name in engines:
+        start = time.perf_counter()
+        result = ENGINES[name](brace_type, heights, pressures)
+        elapsed = time.perf_counter() - start
+        entry = compare(reference_loads, has_loads, result, heights, pressures, atol, rtol)
+        entry["points_per_s"] = len(heights) / elapsed
+        entry["speedup"] = reference_s / elapsed
+        status_mismatched = np.flatnonzero(load_status(brace_type, heights, pressures, result["valid"]) != reference_status)
+        entry["status_mismatched"] = len(status_mismatched)
+        entry["examples"]["status_mismatched"] = _example(heights, pressures, status_mismatched)
+        entry["passed"] = not (entry["out_of_tolerance"] or entry["missing"] or entry["spurious"] or entry["status_mismatched"])
+        results[name] = entry
+    summary = {
+        "points": len(heights),
+        "edge_points": len(edge_h),
+        "with_loads": int(has_loads.sum()),
+        "points_per_s": len(heights) / reference_s,
+        "messages": check_messages(brace_type, heights, pressures, errors),
+        "pchip_gaps": check_pchip_gaps(brace_type, heights, pressures, rng, atol, rtol),
+        "service_json": check_service_json(brace_type, heights, pressures, rng),
+    }
+    return results, summary
+
+def run_fuzz(brace_types=None, engines=None, points=DEFAULT_POINTS, seed=0, atol=DEFAULT_ATOL, rtol=DEFAULT_RTOL, workers=FUZZ_WORKERS):
+    """Fuzz the engines on each brace type; returns {"types": ..., "engines": ..., "passed": bool}."""
+    brace_types = brace_types or current_catalog().brace_types
+    engines = engines or list(ENGINES)
+    rng = np.random.default_rng(seed)
+    run = {"types": {}, "engines": {name: {} for name in engines}}
+    for brace_type in brace_types:
+        results, summary = fuzz_type(brace_type, engines, points, rng, atol, rtol, workers)
+        run["types"][brace_type] = summary
+        for name, entry in results.items():
+            run["engines"][name][brace_type] = entry
+    run["passed"] = (all(entry["passed"] for results in run["engines"].values() for entry in results.values())
+                     and not any(summary["messages"]["mismatched"] or summary["pchip_gaps"]["out_of_tolerance"] or summary["service_json"]["mismatched"]
+                                 for summary in run["types"].values()))
+    return run
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the batch load engines against get_loads on random and edge-case inputs.")
+    parser.add_argument("--points", type=int, default=DEFAULT_POINTS, help="random points per brace type (default: %(default)s)")
+    parser.add_argument("--types", nargs="+", help="brace types to fuzz (default: all)")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), help="engines to check (default: all)")
+    parser.add_argument("--edition", default=DEFAULT_EDITION, help="catalog edition (default: %(default)s)")
+    parser.add_argument("--atol", type=float, default=DEFAULT_ATOL, help="absolute tolerance (default: %(default)s)")
+    parser.add_argument("--rtol", type=float, default=DEFAULT_RTOL, help="relative tolerance (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=FUZZ_WORKERS, help="processes for the reference (default: %(default)s)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON results file (default: %(default)s)")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 on any mismatch")
+    args = parser.parse_args(argv)
+
+    with use_edition(args.edition) as catalog:
+        unknown = sorted(set(args.types or []) - set(catalog.brace_types))
+        if unknown:
+            parser.error(f"unknown brace types: {', '.join(unknown)}")
+        run = {
+            "environment": environment(),
+            "settings": {"points": args.points, "seed": args.seed, "atol": args.atol, "rtol": args.rtol},
+            **run_fuzz(args.types, args.engines, args.points, args.seed, args.atol, args.rtol, args.workers),
+        }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(run, f, indent=2)
+
+    for brace_type, summary in run["types"].items():
+        messages, pchip, service_json = summary["messages"], summary["pchip_gaps"], summary["service_json"]
+        print(f"{brace_type:<14} {summary['points']:>10,} points ({summary['edge_points']:,} edge, {summary['with_loads']:,} with loads), "
+              f"get_loads {summary['points_per_s']:>10,.0f} points/s, messages {messages['checked'] - messages['mismatched']}/{messages['checked']} match, "
+              f"pchip next to gaps {pchip['checked'] - pchip['out_of_tolerance']}/{pchip['checked']} match, "
+              f"service JSON {service_json['checked'] - len(service_json['mismatched'])}/{service_json['checked']} match"
+              + (f" ({', '.join(service_json['mismatched'])} FAILED)" if service_json["mismatched"] else ""))
+    for name, results in run["engines"].items():
+        for brace_type, entry in results.items():
+            worst = entry["worst"]
+            if worst is None:
+                deviation = "-"
+            elif worst["abs"] == 0:
+                deviation = "exact"
+            else:
+                deviation = f"{worst['abs']:.3g} ({worst['field']} at {worst['height']:g} m, {worst['pressure']:g} kN/m²)"
+            print(f"{name:<26} {brace_type:<14} x{entry['speedup']:>8.1f}  worst {deviation:<44} "
+                  f"out of tolerance {entry['out_of_tolerance']}, missing {entry['missing']}, spurious {entry['spurious']}, status {entry['status_mismatched']}"
+                  + ("" if entry["passed"] else "  FAILED"))
+    print("PASSED" if run["passed"] else "FAILED")
+    return 1 if args.check and not run["passed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""Vectorized load lookup over the dense NumPy grids of the current catalog edition."""
+import bisect
+import functools
+
+import numpy as np
+
+from .catalog import current_catalog
+from .loads import FINAL_KEYS, LOAD_KEYS, LoadStatus
+
+LOAD_DTYPE = np.dtype([(key, np.float64) for key in LOAD_KEYS] + [("valid", np.bool_)])
+# Batch counterpart of LoadResult: loads, final values and a LoadStatus code per point
+RESULT_DTYPE = np.dtype([(key, np.float64) for key in LOAD_KEYS + FINAL_KEYS] + [("status", np.int8)])
+
+def _bracket(axis, x):
+    """Indices of the nearest grid points at or below / at or above each x."""
+    low = np.clip(axis.searchsorted(x, side="right") - 1, 0, len(axis) - 1)
+    high = np.clip(axis.searchsorted(x, side="left"), 0, len(axis) - 1)
+    return low, high
+
+def _interpolate_arrays(x, x0, x1, y0, y1):
+    """Array form of interpolate_value; returns y0 where x0 == x1."""
+    same = x0 == x1
+    num = np.where(same, 0.0, x - x0)
+    den = np.where(same, 1.0, x1 - x0)
+    return y0 + (y1 - y0) * num / den
+
+def get_loads_batch(brace_type, heights, pressures):
+    """Vectorized get_loads over arrays of heights and pressures.
+
+    Returns a structured array with the fields e, Z, V1, V2, f and valid.
+    Points that are out of range or fall on a catalog gap have valid=False
+    and NaN loads.
+    """
+    grids = current_catalog().grids
+    if brace_type not in grids:
+        raise ValueError("Brace frame type not supported.")
+    return interpolate_grid(grids[brace_type], heights, pressures)
+
+def interpolate_grid(grid, heights, pressures):
+    """get_loads_batch on one grid of Catalog.grids."""
+    h_axis, p_axis, values = grid["heights"], grid["pressures"], grid["values"]
+
+    height, pressure = np.broadcast_arrays(np.asarray(heights, dtype=np.float64), np.asarray(pressures, dtype=np.float64))
+    in_range = (height >= h_axis[0]) & (height <= h_axis[-1]) & (pressure >= p_axis[0]) & (pressure <= p_axis[-1])
+
+    h_low, h_high = _bracket(h_axis, height)
+    p_low, p_high = _bracket(p_axis, pressure)
+    h, p = height[..., None], pressure[..., None]
+    h0, h1 = h_axis[h_low][..., None], h_axis[h_high][..., None]
+    p0, p1 = p_axis[p_low][..., None], p_axis[p_high][..., None]
+
+    # Same evaluation order as get_loads: pressure first, then height
+    low_interp = _interpolate_arrays(p, p0, p1, values[h_low, p_low], values[h_low, p_high])
+    high_interp = _interpolate_arrays(p, p0, p1, values[h_high, p_low], values[h_high, p_high])
+    loads = _interpolate_arrays(h, h0, h1, low_interp, high_interp)
+
+    valid = in_range & ~np.isnan(loads).any(axis=-1)
+    loads[~valid] = np.nan
+
+    result = np.empty(height.shape, dtype=LOAD_DTYPE)
+    for k, key in enumerate(LOAD_KEYS):
+        result[key] = loads[..., k]
+    result["valid"] = valid
+    return result
+
+def get_loads_all_types(heights, pressures):
+    """get_loads_batch for every brace type in one call.
+
+    Returns the list of brace types and a structured array of shape
+    (number of types,) + the broadcast input shape, in that type order.
+    """
+    brace_types = current_catalog().brace_types
+    height, pressure = np.broadcast_arrays(np.asarray(heights, dtype=np.float64), np.asarray(pressures, dtype=np.float64))
+    result = np.empty((len(brace_types),) + height.shape, dtype=LOAD_DTYPE)
+    for t, brace_type in enumerate(brace_types):
+        result[t] = get_loads_batch(brace_type, height, pressure)
+    return brace_types, result
+
+def load_status(brace_type, heights, pressures, valid):
+    """LoadStatus code per point, as get_loads reports it, for the valid mask of a batch engine."""
+    height, pressure, valid = np.broadcast_arrays(np.asarray(heights, dtype=np.float64), np.asarray(pressures, dtype=np.float64), valid)
+    grids = current_catalog().grids
+    if brace_type not in grids:
+        return np.full(height.shape, LoadStatus.UNSUPPORTED_TYPE, dtype=np.int8)
+    h_axis, p_axis = grids[brace_type]["heights"], grids[brace_type]["pressures"]
+    status = np.full(height.shape, LoadStatus.NO_DATA, dtype=np.int8)
+    status[(height < h_axis[0]) | (height > h_axis[-1]) | (pressure < p_axis[0]) | (pressure > p_axis[-1])] = LoadStatus.OUT_OF_RANGE
+    status[np.isnan(height) | np.isnan(pressure)] = LoadStatus.INVALID_INPUT
+    status[valid] = LoadStatus.OK
+    return status
+
+def load_results(brace_type, heights, pressures, loads):
+    """LOAD_DTYPE loads of any batch engine as a RESULT_DTYPE array.
+
+    Adds the final values at spacing e and the status code of each point;
+    load_error gives the message of a point whose status is not OK.
+    """
+    results = np.empty(loads.shape, dtype=RESULT_DTYPE)
+    for key in LOAD_KEYS:
+        results[key] = loads[key]
+    for key in LOAD_KEYS[1:]:
+        results[f"final_{key}"] = loads[key] * loads["e"]
+    results["status"] = load_status(brace_type, heights, pressures, loads["valid"])
+    return results
+
+@functools.lru_cache(maxsize=None)
+def _range_error(catalog, brace_type):
+    heights, pressures = catalog.ranges(brace_type)
+    bounds = (min(heights), max(heights), min(pressures), max(pressures))
+    return bounds, f"Input out of range for {brace_type}. Height range: {bounds[0]}-{bounds[1]} m, Pressure range: {bounds[2]}-{bounds[3]} kN/m²."
+
+def load_error(brace_type, height, pressure):
+    """Error text for a point get_loads_batch marked invalid, worded as in get_loads."""
+    catalog = current_catalog()
+    if brace_type not in catalog.grids:
+        return "Brace frame type not supported."
+    if height != height or pressure != pressure:
+        return "Height and pressure must be numbers."
+    (h_min, h_max, p_min, p_max), message = _range_error(catalog, brace_type)
+    if height < h_min or height > h_max or pressure < p_min or pressure > p_max:
+        return message
+    # Name the missing catalog point as get_loads does: the upper corner first, then the others
+    data = catalog.data[brace_type]["data"]
+    heights, pressures = catalog.ranges(brace_type)
+    i, j = bisect.bisect_left(heights, height), bisect.bisect_left(pressures, pressure)
+    h_high, p_high = heights[i], pressures[j]
+    h_low = h_high if h_high == height else heights[i - 1]
+    p_low = p_high if p_high == pressure else pressures[j - 1]
+    for h, p in [(h_high, p_high), (h_low, p_low), (h_high, p_low), (h_low, p_high)]:
+        if p not in data.get(h, {}):
+            break
+    return f"Data not available for {brace_type} at height {h} m and pressure {p} kN/m²."
+
+def __getattr__(name):
+    if name == "brace_frame_grids":
+        return current_catalog().grids
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
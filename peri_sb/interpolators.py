@@ -0,0 +1,157 @@
+"""Prebuilt SciPy interpolators per brace type with a selectable interpolation mode.
+
+Modes:
+
+- ``linear``: bilinear, as in get_loads (scipy RegularGridInterpolator).
+- ``pchip``: monotone piecewise cubic Hermite (shape-preserving, no overshoot
+  between catalog points), applied along pressure and then along height like
+  get_loads. Most types have only three pressure columns, fewer than
+  RegularGridInterpolator's cubic methods accept, so the pressure direction is
+  a prebuilt PchipInterpolator and the height direction is built per batch.
+
+Each interpolator carries all five load fields and is built once per brace
+type, mode and catalog edition, then shared by every call in the process.
+
+Catalog gaps are handled explicitly: a point is valid only if the catalog
+points around it exist, exactly as in get_loads_batch; everything else is NaN
+with valid=False. pchip splines are built on existing catalog points only: each
+height row gets one spline per run of adjacent existing pressures, and along
+height each point uses the run of adjacent rows that have a value at its
+pressure. Gap cells never enter a stencil, so values next to a gap do not
+depend on them. The linear surface sees gaps as zeros, which only ever get
+weight zero at valid points.
+"""
+import functools
+
+import numpy as np
+from scipy.interpolate import PchipInterpolator, RegularGridInterpolator
+
+from .catalog import current_catalog
+from .grid import LOAD_DTYPE, _bracket
+from .loads import LOAD_KEYS
+
+INTERPOLATION_MODES = {
+    "linear": "Linear (catalog method)",
+    "pchip": "Monotone cubic (PCHIP)",
+}
+# Points evaluated per block in pchip mode, bounding the (heights x points x fields) temporaries
+PCHIP_BLOCK = 8192
+
+def _runs(present):
+    """(first, last) index of each run of adjacent True values."""
+    runs = []
+    first = None
+    for j, flag in enumerate(present.tolist() + [False]):
+        if flag and first is None:
+            first = j
+        elif not flag and first is not None:
+            runs.append((first, j - 1))
+            first = None
+    return runs
+
+class BraceInterpolator:
+    """Batch evaluator of one brace type's loads in one interpolation mode."""
+    def __init__(self, brace_type, mode="linear", catalog=None):
+        if mode not in INTERPOLATION_MODES:
+            raise ValueError(f"Unknown interpolation mode {mode!r}; expected one of {', '.join(INTERPOLATION_MODES)}.")
+        grid = (catalog or current_catalog()).grids[brace_type]
+        self.brace_type = brace_type
+        self.mode = mode
+        self.heights = grid["heights"]
+        self.pressures = grid["pressures"]
+        self.present = ~np.isnan(grid["values"][..., 0])
+        if mode == "linear":
+            values = np.where(self.present[..., None], grid["values"], 0.0)
+            self._surface = RegularGridInterpolator((self.heights, self.pressures), values, method="linear", bounds_error=False, fill_value=np.nan)
+        else:
+            # Per height row: (lowest pressure, highest pressure, spline) per run of existing pressures;
+            # a single existing pressure is kept as its loads
+            self._rows = []
+            for i in range(len(self.heights)):
+                row = []
+                for first, last in _runs(self.present[i]):
+                    values = grid["values"][i, first:last + 1]
+                    spline = PchipInterpolator(self.pressures[first:last + 1], values, axis=0) if last > first else values[0]
+                    row.append((self.pressures[first], self.pressures[last], spline))
+                self._rows.append(row)
+
+    def covered(self, height, pressure):
+        """True where the point is in range and every catalog point around it exists."""
+        in_range = (height >= self.heights[0]) & (height <= self.heights[-1]) & (pressure >= self.pressures[0]) & (pressure <= self.pressures[-1])
+        h_low, h_high = _bracket(self.heights, height)
+        p_low, p_high = _bracket(self.pressures, pressure)
+        present = self.present
+        return in_range & present[h_low, p_low] & present[h_low, p_high] & present[h_high, p_low] & present[h_high, p_high]
+
+    def _row_values(self, pressure):
+        """Loads of every height row at each pressure, NaN where the row has no run covering it."""
+        rows = np.full((len(self.heights), len(pressure), len(LOAD_KEYS)), np.nan)
+        for i, row in enumerate(self._rows):
+            for low, high, spline in row:
+                covered = (pressure >= low) & (pressure <= high)
+                if covered.any():
+                    rows[i, covered] = spline(pressure[covered]) if callable(spline) else spline
+        return rows
+
+    def _pchip(self, height, pressure):
+        loads = np.empty(height.shape + (len(LOAD_KEYS),))
+        index = np.arange(len(self.heights))[:, None]
+        for start in range(0, len(height), PCHIP_BLOCK):
+            h = height[start:start + PCHIP_BLOCK]
+            rows = self._row_values(pressure[start:start + PCHIP_BLOCK])
+            # Run of adjacent rows with a value around each point's height bracket
+            missing = np.isnan(rows[..., 0])
+            h_low, h_high = _bracket(self.heights, h)
+            n = np.arange(len(h))
+            first = np.maximum.accumulate(np.where(missing, index, -1), axis=0)[h_low, n] + 1
+            last = np.minimum.accumulate(np.where(missing, index, len(self.heights))[::-1], axis=0)[::-1][h_high, n] - 1
+            # One spline along height per distinct run
+            runs, group = np.unique(first * len(self.heights) + last, return_inverse=True)
+            block = loads[start:start + PCHIP_BLOCK]
+            for g, run in enumerate(runs.tolist()):
+                points = np.flatnonzero(group == g)
+                i0, i1 = divmod(run, len(self.heights))
+                if i1 == i0:
+                    block[points] = rows[i0, points]
+                    continue
+                axis = self.heights[i0:i1 + 1]
+                c = PchipInterpolator(axis, rows[i0:i1 + 1, points], axis=0).c
+                i = np.clip(axis.searchsorted(h[points], side="right") - 1, 0, len(axis) - 2)
+                m = np.arange(len(points))
+                dx = (h[points] - axis[i])[:, None]
+                block[points] = ((c[0, i, m] * dx + c[1, i, m]) * dx + c[2, i, m]) * dx + c[3, i, m]
+        return loads
+
+    def __call__(self, heights, pressures):
+        """Structured array like get_loads_batch for arrays of heights and pressures."""
+        height, pressure = np.broadcast_arrays(np.asarray(heights, dtype=np.float64), np.asarray(pressures, dtype=np.float64))
+        shape = height.shape
+        height, pressure = height.reshape(-1), pressure.reshape(-1)
+        valid = self.covered(height, pressure)
+        loads = np.full(height.shape + (len(LOAD_KEYS),), np.nan)
+        if valid.any():
+            if self.mode == "linear":
+                loads[valid] = self._surface(np.stack([height[valid], pressure[valid]], axis=-1))
+            else:
+                loads[valid] = self._pchip(height[valid], pressure[valid])
+
+        result = np.empty(shape, dtype=LOAD_DTYPE)
+        for k, key in enumerate(LOAD_KEYS):
+            result[key] = loads[:, k].reshape(shape)
+        result["valid"] = valid.reshape(shape)
+        return result
+
+def get_interpolator(brace_type, mode="linear"):
+    """Shared BraceInterpolator for a brace type and mode of the current catalog, built on first use."""
+    catalog = current_catalog()
+    if brace_type not in catalog.grids:
+        raise ValueError("Brace frame type not supported.")
+    return _shared_interpolator(catalog, brace_type, mode)
+
+@functools.lru_cache(maxsize=None)
+def _shared_interpolator(catalog, brace_type, mode):
+    return BraceInterpolator(brace_type, mode, catalog)
+
+def interpolate_loads(brace_type, heights, pressures, mode="linear"):
+    """get_loads_batch with a selectable interpolation mode."""
+    return get_interpolator(brace_type, mode)(heights, pressures)
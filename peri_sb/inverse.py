@@ -0,0 +1,63 @@
+"""Inverse queries: the largest height or pressure that keeps a final value within a limit.
+
+The search runs over the app's input grid (0.01 m, 1 kN/m²) of each brace
+type. A height (or pressure) is admissible if the catalog covers it and the
+final value (per-metre value × e) does not exceed the limit; catalog gaps are
+not admissible. The maximum pressure is the largest admissible pressure, as
+final values need not rise with pressure. The maximum height is the top of
+the admissible run starting at the lowest height the catalog covers, since a
+rising pour passes through every lower stage. All limits and fixed inputs of
+a type are answered with one batched lookup.
+"""
+import numpy as np
+
+from .catalog import current_catalog
+from .lookup import input_axes, lookup_loads
+
+INVERSE_KEYS = ["Z", "V1", "V2", "f"]
+
+def _max_admissible(brace_types, key, limits, fixed, axis_name):
+    if key not in INVERSE_KEYS:
+        raise ValueError(f"Unknown quantity {key!r}; expected one of {', '.join(INVERSE_KEYS)}.")
+    single = isinstance(brace_types, str)
+    brace_types = [brace_types] if single else list(brace_types)
+    limits, fixed = np.broadcast_arrays(np.asarray(limits, dtype=np.float64), np.asarray(fixed, dtype=np.float64))
+    shape = limits.shape
+    limits, fixed = limits.reshape(-1), fixed.reshape(-1)
+
+    result = np.full((len(brace_types), len(limits)), np.nan)
+    for t, brace_type in enumerate(brace_types):
+        if brace_type not in current_catalog().grids:
+            raise ValueError("Brace frame type not supported.")
+        heights, pressures = input_axes(current_catalog().grids[brace_type])
+        axis = heights if axis_name == "heights" else pressures
+        if axis_name == "heights":
+            loads = lookup_loads(brace_type, axis[:, None], fixed[None, :])
+        else:
+            loads = lookup_loads(brace_type, fixed[None, :], axis[:, None])
+        admissible = loads["valid"] & (loads[key] * loads["e"] <= limits[None, :])
+        if axis_name == "heights":
+            # Heights below the lowest covered one are skipped; above it, the run stops at the first inadmissible height
+            covered = np.logical_or.accumulate(loads["valid"], axis=0)
+            admissible &= np.logical_and.accumulate(admissible | ~covered, axis=0)
+        top = len(axis) - 1 - np.argmax(admissible[::-1], axis=0)
+        result[t] = np.where(admissible.any(axis=0), axis[top], np.nan)
+    result = result.reshape((len(brace_types),) + shape)
+    return result[0] if single else result
+
+def max_height(brace_types, key, limits, pressures):
+    """Largest admissible concreting height at each pressure for a limit on final `key`.
+
+    brace_types is one type or a list; limits and pressures broadcast against
+    each other. The result has a leading brace type axis when a list is given
+    and is NaN where not even the lowest height the catalog covers is admissible.
+    """
+    return _max_admissible(brace_types, key, limits, pressures, "heights")
+
+def max_pressure(brace_types, key, limits, heights):
+    """Largest admissible fresh concrete pressure at each height for a limit on final `key`.
+
+    Same conventions as max_height, but any admissible pressure counts; NaN
+    where none is.
+    """
+    return _max_admissible(brace_types, key, limits, heights, "pressures")
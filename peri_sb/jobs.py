@@ -0,0 +1,271 @@
+"""Background report jobs: submit, poll and fetch, so reruns never wait for a render.
+
+A JobQueue runs report renders on a small pool of worker threads started on
+first use. Jobs are keyed on their inputs: submitting a key that is queued,
+running or done but not yet fetched returns the existing job, so identical
+requests from any session are rendered once. Fetching the result hands it
+over and forgets the job; the queue is not a result cache. Failed and
+cancelled jobs are not reused, so submitting their key again retries.
+
+At most `workers` jobs run at a time and one owner (the app uses one per
+session) never holds more than `per_owner` of them. Queued jobs are taken
+round-robin across owners, so a user with many queued renders does not delay
+the next user's report by more than one render.
+
+Renders are counted separately in `render_slots`, also `workers` wide: a job
+holds one slot while it runs, and a job that renders in parallel itself (the
+segment export) holds one per render in flight. So `workers` bounds the
+renders of all jobs together, not just the jobs.
+
+Jobs run in a copy of the submitter's context, so they see the catalog edition
+that was in use when they were submitted, with a StageTimer of their own: a
+finished job's status carries its timing record (run time and stages) for the
+session that fetches it. Finished jobs are kept for polling until their result
+is fetched, for at most JOB_TTL seconds and JOB_HISTORY jobs; a result dropped
+unfetched is passed to the job's discard callback, if any.
+"""
+import contextvars
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+from .timing import StageTimer
+
+REPORT_WORKERS = int(os.environ.get("PERI_SB_REPORT_WORKERS", "3"))
+JOB_HISTORY = 16
+# Seconds a finished job waits for its result to be fetched
+JOB_TTL = float(os.environ.get("PERI_SB_JOB_TTL", "600"))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+class JobCancelled(Exception):
+    """Raised inside a job's progress callback once the job has been cancelled."""
+
+class Job:
+    """One submitted render; see JobQueue.status for the public view."""
+    def __init__(self, key, fn, args, kwargs, owner, progress, parallel, discard):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.owner = owner
+        self.status = QUEUED
+        self.progress = (0, 0) if progress else None
+        self.parallel = parallel
+        self.discard = discard
+        self.cancelled = False
+        self.result = None
+        self.error = None
+        self.timing = None
+        self.submitted = time.monotonic()
+        self.started = None
+        self.finished = None
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+        self._context = contextvars.copy_context()
+
+    def report(self, done, total):
+        """Progress callback handed to jobs submitted with progress=True."""
+        if self.cancelled:
+            raise JobCancelled()
+        self.progress = (done, total)
+
+    def run(self, render_slots):
+        kwargs = dict(self._kwargs)
+        if self.progress is not None:
+            kwargs["on_progress"] = self.report
+        if self.parallel:
+            return self._context.run(self._timed, *self._args, render_slots=render_slots, **kwargs)
+        with render_slots:
+            return self._context.run(self._timed, *self._args, **kwargs)
+
+    def _timed(self, *args, **kwargs):
+        timer = StageTimer(history=1)
+        token = timer.start()
+        try:
+            return self._fn(*args, **kwargs)
+        finally:
+            self.timing = timer.finish(token, event="job")
+
+class JobQueue:
+    """Bounded, deduplicating, owner-fair pool of background jobs."""
+    def __init__(self, workers=REPORT_WORKERS, per_owner=None, history=JOB_HISTORY, ttl=JOB_TTL):
+        self.workers = max(1, workers)
+        self.per_owner = per_owner or max(1, self.workers - 1)
+        self.history = history
+        self.ttl = ttl
+        self.render_slots = threading.BoundedSemaphore(self.workers)
+        self._lock = threading.Condition()
+        self._jobs = {}
+        self._by_key = {}
+        self._pending = OrderedDict()
+        self._running = {}
+        self._finished = deque()
+        self._threads = []
+
+    def submit(self, key, fn, *args, owner=None, progress=False, parallel=False, discard=None, **kwargs):
+        """Queue fn(*args, **kwargs) under key and return the job id.
+
+        If a job for key is queued, running or done and not yet fetched, its id
+        is returned instead. discard(result) is called if the job's result is
+        dropped without being fetched, e.g. to remove a file it wrote.
+        With progress=True, fn is also passed on_progress(done, total), which
+        raises JobCancelled once the job is cancelled. With parallel=True, fn
+        is passed render_slots and must hold a slot for every render it has
+        in flight; otherwise the job holds one slot while it runs.
+        """
+        with self._lock:
+            self._expire()
+            job_id = self._find(key)
+            if job_id is not None:
+                return job_id
+            job = Job(key, fn, args, kwargs, owner, progress, parallel, discard)
+            self._jobs[job.id] = job
+            self._by_key[key] = job.id
+            self._pending.setdefault(owner, deque()).append(job)
+            if len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name=f"report-job-{len(self._threads) + 1}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._lock.notify()
+            return job.id
+
+    def find(self, key):
+        """Id of the job for key that submit would return, or None."""
+        with self._lock:
+            self._expire()
+            return self._find(key)
+
+    def status(self, job_id):
+        """Status, queue position, progress, error, elapsed seconds and timing record of a job.
+
+        The timing record (see StageTimer.finish) is None until the job has run.
+        Raises KeyError for an unknown job, including one whose result has been
+        fetched or that expired.
+        """
+        with self._lock:
+            self._expire()
+            job = self._jobs[job_id]
+            position = None
+            if job.status == QUEUED:
+                position = 1 + sum(1 for jobs in self._pending.values() for queued in jobs if queued.submitted < job.submitted)
+            end = job.finished or time.monotonic()
+            return {
+                "status": job.status,
+                "position": position,
+                "progress": job.progress,
+                "error": job.error,
+                "elapsed_s": end - (job.started or job.submitted),
+                "timing": job.timing,
+            }
+
+    def result(self, job_id):
+        """Hand over the result of a finished job and forget the job; re-raises its exception if it failed."""
+        with self._lock:
+            job = self._jobs[job_id]
+            if job.status in (QUEUED, RUNNING):
+                raise RuntimeError(f"Job {job_id} is {job.status}.")
+            self._forget(job)
+        if job.status == FAILED:
+            raise job.error
+        if job.status != DONE:
+            raise RuntimeError(f"Job {job_id} is {job.status}.")
+        return job.result
+
+    def cancel(self, job_id):
+        """Cancel a job: a queued job is dropped, a running one stops at its next progress report."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status not in (QUEUED, RUNNING):
+                return
+            job.cancelled = True
+            if job.status == QUEUED:
+                self._pending[job.owner].remove(job)
+                if not self._pending[job.owner]:
+                    del self._pending[job.owner]
+                self._finish(job, CANCELLED)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "running": sum(self._running.values()),
+                "queued": sum(len(jobs) for jobs in self._pending.values()),
+                "finished": len(self._finished),
+            }
+
+    def _find(self, key):
+        job = self._jobs.get(self._by_key.get(key))
+        if job is not None and job.status in (QUEUED, RUNNING, DONE):
+            return job.id
+        return None
+
+    def _next_job(self):
+        """Oldest queued job of the first owner below its limit; that owner moves to the back of the line."""
+        for owner, jobs in self._pending.items():
+            if self._running.get(owner, 0) < self.per_owner:
+                job = jobs.popleft()
+                del self._pending[owner]
+                if jobs:
+                    self._pending[owner] = jobs
+                return job
+        return None
+
+    def _work(self):
+        while True:
+            with self._lock:
+                job = self._next_job()
+                while job is None:
+                    self._lock.wait()
+                    job = self._next_job()
+                job.status = RUNNING
+                job.started = time.monotonic()
+                self._running[job.owner] = self._running.get(job.owner, 0) + 1
+            status, result, error = DONE, None, None
+            try:
+                result = job.run(self.render_slots)
+            except JobCancelled:
+                status = CANCELLED
+            except Exception as exc:
+                status, error = FAILED, exc
+            with self._lock:
+                self._running[job.owner] -= 1
+                if not self._running[job.owner]:
+                    del self._running[job.owner]
+                job.result, job.error = result, error
+                self._finish(job, status)
+                # A slot of this owner is free again
+                self._lock.notify_all()
+
+    def _finish(self, job, status):
+        job.status = status
+        job.finished = time.monotonic()
+        self._finished.append(job)
+        while len(self._finished) > self.history:
+            self._drop(self._finished[0])
+
+    def _expire(self):
+        now = time.monotonic()
+        while self._finished and now - self._finished[0].finished > self.ttl:
+            self._drop(self._finished[0])
+
+    def _drop(self, job):
+        """Forget a finished job whose result was never fetched."""
+        self._forget(job)
+        if job.status == DONE and job.discard is not None:
+            job.discard(job.result)
+        job.result = None
+
+    def _forget(self, job):
+        if job in self._finished:
+            self._finished.remove(job)
+        self._jobs.pop(job.id, None)
+        if self._by_key.get(job.key) == job.id:
+            del self._by_key[job.key]
+
+report_jobs = JobQueue()
@@ -0,0 +1,126 @@
+"""Scalar load lookup with bilinear interpolation between catalog points.
+
+get_loads answers every input with a LoadResult: the loads per metre, the final
+values at spacing e and a LoadStatus, plus the error message when the loads
+could not be calculated. The batch counterpart is grid.RESULT_DTYPE.
+"""
+import enum
+
+from .catalog import LOAD_KEYS, current_catalog
+
+# Loads per metre times the permissible width of influence e, for Z, V1, V2 and f
+FINAL_KEYS = ["final_Z", "final_V1", "final_V2", "final_f"]
+
+class LoadStatus(enum.IntEnum):
+    """Outcome of a load lookup; stored as int8 in the status field of RESULT_DTYPE arrays."""
+    OK = 0
+    UNSUPPORTED_TYPE = 1
+    INVALID_INPUT = 2
+    OUT_OF_RANGE = 3
+    NO_DATA = 4
+
+class LoadResult:
+    """Loads of one input with their final values and status.
+
+    e, Z, V1, V2 and f are per metre; final_Z, final_V1, final_V2 and final_f
+    are the values at spacing e. Unless status is LoadStatus.OK, all of them
+    are NaN and message says why.
+    """
+    __slots__ = ("brace_type", "height", "pressure", "status", "message", "e", "Z", "V1", "V2", "f",
+                 "final_Z", "final_V1", "final_V2", "final_f")
+
+    def __init__(self, brace_type, height, pressure, e, Z, V1, V2, f, status=LoadStatus.OK, message=None):
+        self.brace_type = brace_type
+        self.height = height
+        self.pressure = pressure
+        self.status = status
+        self.message = message
+        self.e = e
+        self.Z = Z
+        self.V1 = V1
+        self.V2 = V2
+        self.f = f
+        self.final_Z = Z * e
+        self.final_V1 = V1 * e
+        self.final_V2 = V2 * e
+        self.final_f = f * e
+
+    @classmethod
+    def failed(cls, brace_type, height, pressure, status, message):
+        nan = float("nan")
+        return cls(brace_type, height, pressure, nan, nan, nan, nan, nan, status, message)
+
+    @property
+    def ok(self):
+        return self.status is LoadStatus.OK
+
+    def as_dict(self):
+        """Loads and final values by name, LOAD_KEYS then FINAL_KEYS."""
+        return {key: getattr(self, key) for key in LOAD_KEYS + FINAL_KEYS}
+
+    def __repr__(self):
+        if not self.ok:
+            return f"LoadResult({self.brace_type!r}, {self.height!r}, {self.pressure!r}, status={self.status.name}, message={self.message!r})"
+        loads = ", ".join(f"{key}={getattr(self, key)!r}" for key in LOAD_KEYS)
+        return f"LoadResult({self.brace_type!r}, {self.height!r}, {self.pressure!r}, {loads})"
+
+def interpolate_value(x, x0, x1, y0, y1):
+    """Linear interpolation between two points."""
+    return y0 + (y1 - y0) * (x - x0) / (x1 - x0)
+
+def _no_data(brace_type, height, pressure, h, p):
+    return LoadResult.failed(brace_type, height, pressure, LoadStatus.NO_DATA,
+                             f"Data not available for {brace_type} at height {h} m and pressure {p} kN/m².")
+
+def get_loads(brace_type, height, pressure):
+    """Retrieve or interpolate loads based on user input, as a LoadResult."""
+    brace_frame_data = current_catalog().data
+    if brace_type not in brace_frame_data:
+        return LoadResult.failed(brace_type, height, pressure, LoadStatus.UNSUPPORTED_TYPE, "Brace frame type not supported.")
+    if height != height or pressure != pressure:
+        return LoadResult.failed(brace_type, height, pressure, LoadStatus.INVALID_INPUT, "Height and pressure must be numbers.")
+
+    data = brace_frame_data[brace_type]["data"]
+    heights = brace_frame_data[brace_type]["heights"]
+    pressures = brace_frame_data[brace_type]["pressures"]
+
+    if height < min(heights) or height > max(heights) or pressure < min(pressures) or pressure > max(pressures):
+        return LoadResult.failed(brace_type, height, pressure, LoadStatus.OUT_OF_RANGE,
+                                 f"Input out of range for {brace_type}. Height range: {min(heights)}-{max(heights)} m, Pressure range: {min(pressures)}-{max(pressures)} kN/m².")
+
+    h_low = max([h for h in heights if h <= height])
+    h_high = min([h for h in heights if h >= height])
+    p_low = max([p for p in pressures if p <= pressure])
+    p_high = min([p for p in pressures if p >= pressure])
+
+    # Catalog points the interpolation needs, upper corner first; a missing (h_low, p_high) falls back to p_low below
+    if h_high not in data or p_high not in data[h_high]:
+        return _no_data(brace_type, height, pressure, h_high, p_high)
+    if h_low not in data or p_low not in data[h_low]:
+        return _no_data(brace_type, height, pressure, h_low, p_low)
+    if p_low not in data[h_high]:
+        return _no_data(brace_type, height, pressure, h_high, p_low)
+
+    if h_low == h_high and p_low == p_high:
+        loads = data[h_low][p_low]
+        return LoadResult(brace_type, height, pressure, loads["e"], loads["Z"], loads["V1"], loads["V2"], loads["f"])
+
+    if h_low == h_high:
+        loads_low = data[h_low][p_low]
+        loads_high = data[h_low][p_high]
+        values = [interpolate_value(pressure, p_low, p_high, loads_low[key], loads_high[key]) for key in LOAD_KEYS]
+    elif p_low == p_high:
+        loads_low = data[h_low][p_low]
+        loads_high = data[h_high][p_low]
+        values = [interpolate_value(height, h_low, h_high, loads_low[key], loads_high[key]) for key in LOAD_KEYS]
+    else:
+        loads_ll = data[h_low][p_low]
+        loads_lh = data[h_low][p_high] if p_high in data[h_low] else data[h_low][p_low]
+        loads_hl = data[h_high][p_low]
+        loads_hh = data[h_high][p_high]
+        values = []
+        for key in LOAD_KEYS:
+            low_interp = interpolate_value(pressure, p_low, p_high, loads_ll[key], loads_lh[key]) if p_high in data[h_low] else loads_ll[key]
+            high_interp = interpolate_value(pressure, p_low, p_high, loads_hl[key], loads_hh[key])
+            values.append(interpolate_value(height, h_low, h_high, low_interp, high_interp))
+    return LoadResult(brace_type, height, pressure, *values)
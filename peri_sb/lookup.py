@@ -0,0 +1,117 @@
+"""Precomputed load table at input resolution, persisted as a memory-mapped file.
+
+The app's inputs are quantized (height step 0.01 m, pressure step 1 kN/m²), so
+every valid input per brace type is a point on a small grid. The table holds
+get_loads_batch evaluated on that grid for every type of a catalog edition and
+is stored as ``lookup_<version>.npy`` in the cache directory, one file per
+catalog version. Processes open it with ``numpy.load(mmap_mode="r")`` and share
+the pages through the OS page cache.
+
+Run ``python -m peri_sb.lookup`` to build the tables of all editions ahead of time.
+"""
+import functools
+import os
+import tempfile
+
+import numpy as np
+
+from .catalog import available_editions, current_catalog, load_catalog
+from .grid import LOAD_DTYPE, get_loads_batch, interpolate_grid
+
+HEIGHT_STEP = 0.01
+PRESSURE_STEP = 1.0
+CACHE_DIR = os.environ.get("PERI_SB_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "peri_sb")
+
+def input_axes(grid):
+    """Heights and pressures of the input grid spanning the first to last heights and pressures of a catalog grid."""
+    heights = np.round(np.arange(round(grid["heights"][0] / HEIGHT_STEP), round(grid["heights"][-1] / HEIGHT_STEP) + 1) * HEIGHT_STEP, 2)
+    pressures = np.arange(grid["pressures"][0], grid["pressures"][-1] + PRESSURE_STEP, PRESSURE_STEP)
+    return heights, pressures
+
+@functools.lru_cache(maxsize=None)
+def table_axes(catalog):
+    """Heights and pressures of the input grid covering every brace type of a catalog."""
+    grids = catalog.grids.values()
+    return input_axes({
+        "heights": [min(grid["heights"][0] for grid in grids), max(grid["heights"][-1] for grid in grids)],
+        "pressures": [min(grid["pressures"][0] for grid in grids), max(grid["pressures"][-1] for grid in grids)],
+    })
+
+def lookup_table_path(catalog=None, cache_dir=CACHE_DIR):
+    catalog = catalog or current_catalog()
+    return os.path.join(cache_dir, f"lookup_{catalog.version}.npy")
+
+def compute_lookup_table(catalog=None):
+    """get_loads_batch over the full input grid; shape (types, heights, pressures)."""
+    catalog = catalog or current_catalog()
+    heights, pressures = table_axes(catalog)
+    table = np.empty((len(catalog.brace_types), len(heights), len(pressures)), dtype=LOAD_DTYPE)
+    for t, brace_type in enumerate(catalog.brace_types):
+        table[t] = interpolate_grid(catalog.grids[brace_type], heights[:, None], pressures[None, :])
+    return table
+
+def build_lookup_table(catalog=None, cache_dir=CACHE_DIR):
+    """Compute the table and write it atomically; returns its path."""
+    catalog = catalog or current_catalog()
+    path = lookup_table_path(catalog, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".lookup_", suffix=".npy")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, compute_lookup_table(catalog))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return path
+
+def load_lookup_table(catalog=None, cache_dir=CACHE_DIR):
+    """Memory-map the table for a catalog (default: the current one), building it first if needed.
+
+    Falls back to an in-memory table if the cache directory is not writable.
+    """
+    return _open_lookup_table(catalog or current_catalog(), cache_dir)
+
+@functools.lru_cache(maxsize=None)
+def _open_lookup_table(catalog, cache_dir):
+    heights, pressures = table_axes(catalog)
+    shape = (len(catalog.brace_types), len(heights), len(pressures))
+    path = lookup_table_path(catalog, cache_dir)
+    try:
+        if os.path.exists(path):
+            table = np.load(path, mmap_mode="r")
+            if table.shape == shape and table.dtype == LOAD_DTYPE:
+                return table
+        return np.load(build_lookup_table(catalog, cache_dir), mmap_mode="r")
+    except (OSError, ValueError):
+        return compute_lookup_table(catalog)
+
+def lookup_loads(brace_type, heights, pressures):
+    """Drop-in for get_loads_batch that reads on-grid inputs from the precomputed table.
+
+    Inputs that are not on the 0.01 m / 1 kN/m² grid are computed with
+    get_loads_batch, so the result always matches it.
+    """
+    catalog = current_catalog()
+    if brace_type not in catalog.grids:
+        raise ValueError("Brace frame type not supported.")
+    table_heights, table_pressures = table_axes(catalog)
+    height, pressure = np.broadcast_arrays(np.asarray(heights, dtype=np.float64), np.asarray(pressures, dtype=np.float64))
+    i = np.rint((height - table_heights[0]) / HEIGHT_STEP)
+    j = np.rint((pressure - table_pressures[0]) / PRESSURE_STEP)
+    on_grid = (i >= 0) & (i < len(table_heights)) & (j >= 0) & (j < len(table_pressures))
+    i = np.where(on_grid, i, 0).astype(np.intp)
+    j = np.where(on_grid, j, 0).astype(np.intp)
+    # Only exact grid values; a nearby float can lie on the other side of a range limit or catalog gap
+    on_grid &= (table_heights[i] == height) & (table_pressures[j] == pressure)
+
+    table = _open_lookup_table(catalog, CACHE_DIR)
+    result = np.asarray(table[catalog.brace_types.index(brace_type)][i, j])
+    if not on_grid.all():
+        result = result.copy()
+        result[~on_grid] = get_loads_batch(brace_type, height[~on_grid], pressure[~on_grid])
+    return result
+
+if __name__ == "__main__":
+    for edition in available_editions():
+        print(f"Lookup table for catalog edition {edition} written to {build_lookup_table(load_catalog(edition))}")
@@ -0,0 +1,54 @@
+"""Brace type optimizer: rank every brace frame type for a height and pressure."""
+import numpy as np
+
+from .grid import get_loads_all_types, load_results
+from .loads import FINAL_KEYS, LOAD_KEYS
+from .validation import bracing_warnings, validate_bracing
+
+# Objective name: (label, load key, multiplied by e, True if larger is better)
+OBJECTIVES = {
+    "max_width": ("Max permissible width e (fewest frames)", "e", False, True),
+    "min_anchor": ("Min anchor force Z × e", "Z", True, False),
+    "min_deflection": ("Min deflection f × e", "f", True, False),
+}
+
+def select_brace_types(heights, pressures, objective="max_width"):
+    """Evaluate all brace types for every point and pick the best admissible one.
+
+    A type is admissible at a point if the point is in its catalog range and
+    validate_bracing raises no warning. Returns a dict with the brace type
+    names, the loads (types x points structured array), the admissible mask,
+    the objective value per type and point, and `best`, the best type per
+    point (None where no type is admissible).
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective {objective!r}; expected one of {', '.join(OBJECTIVES)}.")
+    _, key, per_spacing, larger_is_better = OBJECTIVES[objective]
+    height = np.atleast_1d(np.asarray(heights, dtype=np.float64))
+    pressure = np.atleast_1d(np.asarray(pressures, dtype=np.float64))
+    height, pressure = np.broadcast_arrays(height, pressure)
+    brace_types, loads = get_loads_all_types(height, pressure)
+
+    admissible = loads["valid"] & ~bracing_warnings(np.array(brace_types, dtype=object)[:, None], height, loads["e"])
+
+    value = loads[key] * loads["e"] if per_spacing else loads[key]
+    score = np.where(admissible, -value if larger_is_better else value, np.inf)
+    best_index = np.argmin(score, axis=0)
+    best = np.where(admissible.any(axis=0), np.array(brace_types, dtype=object)[best_index], None)
+    return {"brace_types": brace_types, "loads": loads, "admissible": admissible, "value": value, "best": best}
+
+def rank_brace_types(height, pressure, objective="max_width"):
+    """Admissible brace types for one point, best first, with loads, final values and messages."""
+    selection = select_brace_types(height, pressure, objective)
+    larger_is_better = OBJECTIVES[objective][3]
+    ranking = []
+    for t, brace_type in enumerate(selection["brace_types"]):
+        if not selection["admissible"][t, 0]:
+            continue
+        row = load_results(brace_type, height, pressure, selection["loads"][t])[0]
+        option = {"brace_type": brace_type}
+        option.update({key: float(row[key]) for key in LOAD_KEYS + FINAL_KEYS})
+        option["messages"] = validate_bracing(brace_type, height, option["e"])
+        ranking.append((float(selection["value"][t, 0]), option))
+    ranking.sort(key=lambda item: -item[0] if larger_is_better else item[0])
+    return [option for _, option in ranking]
@@ -0,0 +1,86 @@
+"""Load-surface plots of Z, V1, V2, f and e over the full height x pressure range of a brace type.
+
+Each brace type's surfaces come from one vectorized lookup over the input grid.
+The filled contour maps are drawn once per type and kept as a rendered
+background; marking an input only restores that background and draws the
+marker layer on top (blitting).
+"""
+import functools
+import io
+import threading
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.image import imsave
+
+from .catalog import current_catalog
+from .lookup import input_axes, lookup_loads
+
+SURFACE_KEYS = [
+    ("Z", "Anchor Tension Force Z (kN/m)"),
+    ("V1", "Spindle Force V1 (kN/m)"),
+    ("V2", "Spindle Force V2 (kN/m)"),
+    ("f", "Deflection f (mm/m)"),
+    ("e", "Permissible Width of Influence e (m)"),
+]
+SURFACE_FIGSIZE = (10, 6.5)
+SURFACE_DPI = 100
+SURFACE_LEVELS = 12
+
+def load_surface(brace_type):
+    """Heights, pressures and loads (heights x pressures structured array) of brace_type at input resolution."""
+    heights, pressures = input_axes(current_catalog().grids[brace_type])
+    return heights, pressures, lookup_loads(brace_type, heights[:, None], pressures[None, :])
+
+class SurfacePlot:
+    """Contour maps of one brace type with a movable marker for the current input."""
+    def __init__(self, brace_type):
+        heights, pressures, loads = load_surface(brace_type)
+        self.figure = Figure(figsize=SURFACE_FIGSIZE, dpi=SURFACE_DPI, layout="constrained")
+        self.canvas = FigureCanvasAgg(self.figure)
+        axes = self.figure.subplots(2, 3).ravel()
+        self.markers = []
+        for ax, (key, label) in zip(axes, SURFACE_KEYS):
+            # Catalog gaps are NaN and stay blank; rounding keeps interpolation noise out of the levels
+            values = np.ma.masked_invalid(np.round(loads[key], 6))
+            low, high = values.min(), values.max()
+            levels = SURFACE_LEVELS if high > low else [low - 0.005, high + 0.005]
+            contours = ax.contourf(pressures, heights, values, levels=levels, cmap="viridis")
+            colorbar = self.figure.colorbar(contours, ax=ax, ticks=None if high > low else [low])
+            colorbar.ax.tick_params(labelsize=7)
+            ax.set_title(label, fontsize=9)
+            ax.set_xlabel("Pressure (kN/m²)", fontsize=8)
+            ax.set_ylabel("Height (m)", fontsize=8)
+            ax.tick_params(labelsize=7)
+            marker, = ax.plot([], [], linestyle="", marker="o", markersize=8, color="red", markeredgecolor="white", animated=True)
+            self.markers.append(marker)
+        axes[-1].axis("off")
+        self.figure.suptitle(f"{brace_type} Load Surfaces", fontsize=11)
+        self.canvas.draw()
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._lock = threading.Lock()
+
+    def render_png(self, height, pressure):
+        """PNG of the cached surfaces with the input (height, pressure) marked."""
+        with self._lock:
+            self.canvas.restore_region(self._background)
+            for marker in self.markers:
+                marker.set_data([pressure], [height])
+                marker.axes.draw_artist(marker)
+            image = np.array(self.canvas.buffer_rgba())
+        buffer = io.BytesIO()
+        imsave(buffer, image, format="png")
+        return buffer.getvalue()
+
+def surface_plot(brace_type):
+    """Shared SurfacePlot of a brace type in the current catalog edition."""
+    return _shared_surface_plot(current_catalog(), brace_type)
+
+@functools.lru_cache(maxsize=None)
+def _shared_surface_plot(catalog, brace_type):
+    return SurfacePlot(brace_type)
+
+def load_surface_png(brace_type, height, pressure):
+    """Load surfaces of brace_type as PNG bytes with the input marked."""
+    return surface_plot(brace_type).render_png(height, pressure)
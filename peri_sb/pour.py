@@ -0,0 +1,81 @@
+"""Pour sequence: loads and bracing requirements at every stage of a rising pour."""
+import numpy as np
+
+from .catalog import current_catalog
+from .grid import load_error, load_results
+from .loads import FINAL_KEYS, LOAD_KEYS, LoadStatus
+from .lookup import HEIGHT_STEP, lookup_loads
+from .validation import validate_bracing_batch
+
+POUR_COLUMNS = ["stage", "height", "pressure"] + LOAD_KEYS + FINAL_KEYS + ["status", "notes", "requirements_changed"]
+MAX_POUR_STAGES = 10000
+
+def pour_stages(brace_type, final_height, pour_step, start_height=None):
+    """Concrete heights at each stage, from start_height up to and including final_height.
+
+    start_height defaults to the lowest catalog height of the brace type.
+    Heights are rounded to the input resolution, so pour_step must be at least
+    HEIGHT_STEP; a smaller step would repeat stages.
+    """
+    grids = current_catalog().grids
+    if brace_type not in grids:
+        raise ValueError("Brace frame type not supported.")
+    if not pour_step >= HEIGHT_STEP:
+        raise ValueError(f"Pour step must be at least {HEIGHT_STEP:.2f} m.")
+    if start_height is None:
+        start_height = float(grids[brace_type]["heights"][0])
+    if final_height <= start_height:
+        return np.array([final_height], dtype=np.float64)
+    count = int(np.floor((final_height - start_height) / pour_step + 1e-9)) + 1
+    if count > MAX_POUR_STAGES:
+        raise ValueError(f"Pour sequence has more than {MAX_POUR_STAGES} stages; use a larger pour step.")
+    heights = np.round(start_height + np.arange(count) * pour_step, 2)
+    if heights[-1] < final_height - 1e-9:
+        heights = np.append(heights, final_height)
+    return heights
+
+def pour_sequence(brace_type, final_height, pour_step, pressure, start_height=None):
+    """Stage-by-stage loads, final values and bracing notes of a pour, as result columns.
+
+    The loads of all stages come from one batched lookup. requirements_changed
+    marks the stages whose bracing messages differ from the previous
+    calculated stage.
+    """
+    heights = pour_stages(brace_type, final_height, pour_step, start_height)
+    n = len(heights)
+    loads = load_results(brace_type, heights, pressure, lookup_loads(brace_type, heights, pressure))
+
+    results = {"stage": np.arange(1, n + 1), "height": heights, "pressure": np.full(n, float(pressure))}
+    for key in LOAD_KEYS + FINAL_KEYS:
+        results[key] = loads[key]
+
+    valid = loads["status"] == LoadStatus.OK
+    status = np.full(n, "OK", dtype=object)
+    for i in np.flatnonzero(~valid):
+        status[i] = load_error(brace_type, heights[i], float(pressure))
+    notes = np.full(n, "", dtype=object)
+    changed = np.zeros(n, dtype=bool)
+    if valid.any():
+        message_sets, index = validate_bracing_batch(brace_type, heights[valid], loads["e"][valid])
+        notes[valid] = np.array([" | ".join(messages) for messages in message_sets], dtype=object)[index]
+        # Equal message lists share an index, so a change of index is a change of requirements
+        changed[np.flatnonzero(valid)[1:]] = index[1:] != index[:-1]
+    results["status"] = status
+    results["notes"] = notes
+    results["requirements_changed"] = changed
+    return results
+
+def requirement_changes(results):
+    """(height, added messages, dropped messages) for every stage where the bracing requirements change."""
+    changes = []
+    previous = None
+    for i in range(len(results["stage"])):
+        if results["status"][i] != "OK":
+            continue
+        messages = results["notes"][i].split(" | ")
+        if results["requirements_changed"][i]:
+            changes.append((float(results["height"][i]),
+                            [message for message in messages if message not in previous],
+                            [message for message in previous if message not in messages]))
+        previous = messages
+    return changes
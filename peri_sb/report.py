@@ -0,0 +1,308 @@
+"""PDF reports: single calculation, multi-segment project report and the logo asset."""
+import functools
+import io
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_LEFT, TA_CENTER
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, PageBreak, KeepTogether
+
+from .timing import stage
+
+# Program metadata
+PROGRAM_VERSION = "1.0 - 2025"
+PROGRAM = "PERI Brace Frame Load Calculator"
+COMPANY_NAME = "tekhne Consulting Engineers"
+COMPANY_ADDRESS = "   "  # Update with actual address if needed
+LOGO_URL = "https://drive.google.com/uc?export=download&id=1VebdT2loVGX57noP9t2GgQhwCNn8AA3h"
+FALLBACK_LOGO_URL = "https://onedrive.live.com/download?cid=A48CC9068E3FACE0&resid=A48CC9068E3FACE0%21s252b6fb7fcd04f53968b2a09114d33ed"
+
+# Logo assets: a configured file wins, then the downloaded copy. No logo is bundled, so
+# without network a configured file is required; otherwise reports show a placeholder.
+LOGO_FILE = os.environ.get("PERI_SB_LOGO_FILE", "")
+DOWNLOADED_LOGO_FILE = "logo.png"
+LOGO_PREFETCH = os.environ.get("PERI_SB_LOGO_PREFETCH", "1") != "0"
+
+def logo_candidates():
+    """Local logo files in order of preference."""
+    return [path for path in [LOGO_FILE, DOWNLOADED_LOGO_FILE] if path]
+
+@functools.lru_cache(maxsize=None)
+def load_logo():
+    """Decode the first readable local logo once per process. Never touches the network."""
+    for path in logo_candidates():
+        if os.path.exists(path):
+            try:
+                return ImageReader(path)
+            except Exception:
+                continue
+    return None
+
+_prefetch_lock = threading.Lock()
+_prefetch_thread = None
+
+def prefetch_logo():
+    """Download the logo in a background thread, once per process, if no local copy exists."""
+    global _prefetch_thread
+    with _prefetch_lock:
+        if _prefetch_thread is not None or not LOGO_PREFETCH or any(os.path.exists(path) for path in logo_candidates()):
+            return _prefetch_thread
+        _prefetch_thread = threading.Thread(target=_fetch_logo, name="logo-prefetch", daemon=True)
+        _prefetch_thread.start()
+        return _prefetch_thread
+
+def _fetch_logo():
+    import requests
+
+    for url in [LOGO_URL, FALLBACK_LOGO_URL]:
+        try:
+            response = requests.get(url, stream=True, allow_redirects=True, timeout=10)
+            if 'image' in response.headers.get('Content-Type', '').lower():
+                response.raise_for_status()
+                with open(DOWNLOADED_LOGO_FILE, 'wb') as f:
+                    f.write(response.content)
+                load_logo.cache_clear()
+                break
+        except Exception:
+            continue
+
+class CachedImage(Image):
+    """Image flowable that draws an already decoded ImageReader."""
+    def __init__(self, reader, width=None, height=None):
+        self._img = reader
+        Image.__init__(self, reader.fp, width=width, height=height)
+
+@functools.lru_cache(maxsize=None)
+def pdf_styles():
+    """Paragraph and table styles shared by all reports, built once."""
+    styles = getSampleStyleSheet()
+    cell_style = [
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ('TOPPADDING', (0, 0), (-1, -1), 2),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('LEFTPADDING', (0, 0), (-1, -1), 4),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 4),
+    ]
+    return {
+        "title": ParagraphStyle(name='TitleStyle', parent=styles['Title'], fontSize=14, spaceAfter=8, alignment=TA_CENTER),
+        "subtitle": ParagraphStyle(name='SubtitleStyle', parent=styles['Normal'], fontSize=10, spaceAfter=8, alignment=TA_CENTER),
+        "heading": ParagraphStyle(name='HeadingStyle', parent=styles['Heading2'], fontSize=12, spaceAfter=6),
+        "normal": ParagraphStyle(name='NormalStyle', parent=styles['Normal'], fontSize=9, spaceAfter=6),
+        "table_header": ParagraphStyle(name='TableHeaderStyle', parent=styles['Normal'], fontSize=10, fontName='Helvetica-Bold', alignment=TA_LEFT),
+        "table_cell": ParagraphStyle(name='TableCellStyle', parent=styles['Normal'], fontSize=8, alignment=TA_LEFT, leading=8),
+        "table": TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ] + cell_style),
+        "notes_table": TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ] + cell_style),
+        "header_table": TableStyle([('VALIGN', (0, 0), (-1, -1), 'TOP'), ('ALIGN', (1, 0), (1, 0), 'CENTER')]),
+    }
+
+def build_pdf_header(title, project_number, project_name):
+    """Logo and company block, report title and project details."""
+    styles = pdf_styles()
+    company_text = f"<b>{COMPANY_NAME}</b><br/>{COMPANY_ADDRESS}"
+    company_paragraph = Paragraph(company_text, styles["normal"])
+    with stage("pdf.logo"):
+        logo_reader = load_logo()
+    logo = CachedImage(logo_reader, width=50*mm, height=20*mm) if logo_reader else Paragraph("[Logo Placeholder]", styles["normal"])
+    header_data = [[logo, company_paragraph]]
+    header_table = Table(header_data, colWidths=[60*mm, 120*mm])
+    header_table.setStyle(styles["header_table"])
+
+    project_details = f"Project Number: {project_number}<br/>Project Name: {project_name}<br/>Date: {datetime.now().strftime('%B %d, %Y')}"
+    return [header_table, Spacer(1, 4*mm), Paragraph(title, styles["title"]),
+            Paragraph(project_details, styles["subtitle"]), Spacer(1, 2*mm)]
+
+def build_pdf_elements(brace_type, height, pressure, result, validation_messages, project_number, project_name, surface_png=None):
+    styles = pdf_styles()
+    heading_style = styles["heading"]
+    table_header_style = styles["table_header"]
+    table_cell_style = styles["table_cell"]
+    table_style = styles["table"]
+
+    elements = build_pdf_header("PERI Brace Frame Load Calculation Report", project_number, project_name)
+    elements.append(Paragraph("Input Parameters", heading_style))
+
+    input_data = [
+        ["Parameter", "Value"],
+        ["Brace Frame Type", brace_type],
+        ["Concreting Height (m)", f"{height:.2f}"],
+        ["Fresh Concrete Pressure (kN/m²)", f"{pressure:.2f}"],
+    ]
+    input_table = Table([[Paragraph(row[0], table_header_style if i == 0 else table_cell_style),
+                          Paragraph(row[1], table_header_style if i == 0 else table_cell_style)] for i, row in enumerate(input_data)],
+                        colWidths=[100*mm, 80*mm])
+    input_table.setStyle(table_style)
+    elements.extend([input_table, Spacer(1, 4*mm), Paragraph("Calculated Loads (Per Meter)", heading_style)])
+
+    loads_data = [
+        ["Parameter", "Value"],
+        ["Permissible Width of Influence (e)", f"{result.e:.2f} m"],
+        ["Anchor Tension Force (Z)", f"{result.Z:.2f} kN/m"],
+        ["Spindle Force V1", f"{result.V1:.2f} kN/m"],
+        ["Spindle Force V2", f"{result.V2:.2f} kN/m"],
+        ["Deflection (f)", f"{result.f:.2f} mm/m"],
+    ]
+    loads_table = Table([[Paragraph(row[0], table_header_style if i == 0 else table_cell_style),
+                          Paragraph(row[1], table_header_style if i == 0 else table_cell_style)] for i, row in enumerate(loads_data)],
+                        colWidths=[100*mm, 80*mm])
+    loads_table.setStyle(table_style)
+    elements.extend([loads_table, Spacer(1, 4*mm), Paragraph(f"Final Values Based on {result.e:.2f} m Spacing", heading_style)])
+
+    final_data = [
+        ["Parameter", "Value"],
+        ["Anchor Tension Force (Z)", f"{result.final_Z:.2f} kN"],
+        ["Spindle Force V1", f"{result.final_V1:.2f} kN"],
+        ["Spindle Force V2", f"{result.final_V2:.2f} kN"],
+        ["Deflection (f)", f"{result.final_f:.2f} mm"],
+    ]
+    final_table = Table([[Paragraph(row[0], table_header_style if i == 0 else table_cell_style),
+                          Paragraph(row[1], table_header_style if i == 0 else table_cell_style)] for i, row in enumerate(final_data)],
+                        colWidths=[100*mm, 80*mm])
+    final_table.setStyle(table_style)
+    elements.extend([final_table, Spacer(1, 4*mm), Paragraph("Validation and Notes", heading_style)])
+
+    notes_data = [["Notes"]] + [[Paragraph(msg, table_cell_style)] for msg in validation_messages]
+    notes_table = Table(notes_data, colWidths=[180*mm])
+    notes_table.setStyle(styles["notes_table"])
+    elements.append(notes_table)
+    if surface_png is not None:
+        surface = Image(io.BytesIO(surface_png), width=180*mm, height=117*mm)
+        elements.append(KeepTogether([Spacer(1, 4*mm), Paragraph("Load Surfaces", heading_style), surface]))
+    return elements
+
+def draw_footer(canvas, doc):
+    canvas.saveState()
+    canvas.setFont('Helvetica', 10)
+    page_num = canvas.getPageNumber()
+    canvas.drawCentredString(doc.pagesize[0] / 2.0, 10 * mm, f"{PROGRAM} {PROGRAM_VERSION} | tekhne © | Page {page_num}")
+    canvas.restoreState()
+
+def generate_pdf_report(brace_type, height, pressure, result, validation_messages, project_number, project_name, surface_png=None):
+    pdf_buffer = io.BytesIO()
+    doc = SimpleDocTemplate(pdf_buffer, pagesize=A4, leftMargin=15*mm, rightMargin=15*mm, topMargin=15*mm, bottomMargin=15*mm)
+    with stage("pdf.elements"):
+        elements = build_pdf_elements(brace_type, height, pressure, result, validation_messages, project_number, project_name, surface_png)
+    with stage("pdf.build"):
+        doc.build(elements, onFirstPage=draw_footer, onLaterPages=draw_footer)
+    pdf_buffer.seek(0)
+    return pdf_buffer.getvalue()
+
+# Project report covering every segment of a wall schedule
+SUMMARY_ROWS_PER_TABLE = 40
+
+class FlowableStream(list):
+    """Flowable list that doc.build fills on demand from an iterator.
+
+    Only a small look-ahead window is held in memory, so reports of hundreds
+    of pages never keep every flowable alive at once.
+    """
+    def __init__(self, flowables, lookahead=32):
+        super().__init__()
+        self._source = iter(flowables)
+        self._lookahead = lookahead
+
+    def __len__(self):
+        while self._source is not None and list.__len__(self) < self._lookahead:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+        return list.__len__(self)
+
+class PageTimer:
+    """Page callback that records how long each page took to lay out and draw."""
+    def __init__(self, on_page=draw_footer):
+        self.on_page = on_page
+        self.page_times = []
+        self._page_start = None
+
+    def __call__(self, canvas, doc):
+        self.lap()
+        self.on_page(canvas, doc)
+
+    def lap(self):
+        now = time.perf_counter()
+        if self._page_start is not None:
+            self.page_times.append(now - self._page_start)
+        self._page_start = now
+
+def _fmt(value, spec=".2f"):
+    return "-" if np.isnan(value) else format(value, spec)
+
+def build_segment_elements(results, i):
+    """Heading line, compact load table and notes for schedule row i."""
+    styles = pdf_styles()
+    e = results["e"][i]
+    details = (f"<b>Segment {results['id'][i]}</b>: {results['brace_type'][i]}, "
+               f"H = {_fmt(results['height'][i])} m, p = {_fmt(results['pressure'][i], 'g')} kN/m², "
+               f"L = {_fmt(results['length'][i])} m")
+    if results["status"][i] != "OK":
+        return [Paragraph(details, styles["normal"]), Paragraph(results["status"][i], styles["table_cell"]), Spacer(1, 3*mm)]
+
+    details += f", {_fmt(results['frames'][i], '.0f')} frames at e = {e:.2f} m"
+    loads_data = [
+        ["", "Z", "V1", "V2", "f"],
+        ["Per metre", f"{results['Z'][i]:.2f} kN/m", f"{results['V1'][i]:.2f} kN/m", f"{results['V2'][i]:.2f} kN/m", f"{results['f'][i]:.2f} mm/m"],
+        [f"Final (e = {e:.2f} m)", f"{results['final_Z'][i]:.2f} kN", f"{results['final_V1'][i]:.2f} kN", f"{results['final_V2'][i]:.2f} kN", f"{results['final_f'][i]:.2f} mm"],
+    ]
+    loads_table = Table(loads_data, colWidths=[40*mm, 35*mm, 35*mm, 35*mm, 35*mm])
+    loads_table.setStyle(styles["table"])
+    notes = Paragraph(results["notes"][i].replace(" | ", "<br/>"), styles["table_cell"])
+    return [KeepTogether([Paragraph(details, styles["normal"]), loads_table, Spacer(1, 1*mm), notes]), Spacer(1, 3*mm)]
+
+def build_summary_tables(results):
+    """Summary of all segments, split into tables of SUMMARY_ROWS_PER_TABLE rows."""
+    styles = pdf_styles()
+    header = ["Segment", "Brace Frame", "H (m)", "p (kN/m²)", "e (m)", "Z final (kN)", "Frames", "Status"]
+    for start in range(0, len(results["id"]), SUMMARY_ROWS_PER_TABLE):
+        rows = [header]
+        for i in range(start, min(start + SUMMARY_ROWS_PER_TABLE, len(results["id"]))):
+            ok = results["status"][i] == "OK"
+            rows.append([str(results["id"][i]), results["brace_type"][i], _fmt(results["height"][i]), _fmt(results["pressure"][i], "g"),
+                         _fmt(results["e"][i]), _fmt(results["final_Z"][i]), _fmt(results["frames"][i], ".0f"), "OK" if ok else "Not calculated"])
+        table = Table(rows, colWidths=[25*mm, 30*mm, 17*mm, 20*mm, 17*mm, 25*mm, 16*mm, 30*mm], repeatRows=1)
+        table.setStyle(styles["table"])
+        yield table
+
+def build_project_elements(results, project_number, project_name):
+    """Flowables of the project report, produced lazily: header, summary page, then one block per segment."""
+    styles = pdf_styles()
+    yield from build_pdf_header("PERI Brace Frame Project Report", project_number, project_name)
+    calculated = int(np.count_nonzero(results["status"] == "OK"))
+    yield Paragraph("Summary", styles["heading"])
+    yield Paragraph(f"Segments: {len(results['id'])}, calculated: {calculated}, not calculated: {len(results['id']) - calculated}.", styles["normal"])
+    yield from build_summary_tables(results)
+    yield PageBreak()
+    yield Paragraph("Segment Results", styles["heading"])
+    for i in range(len(results["id"])):
+        yield from build_segment_elements(results, i)
+
+def generate_project_report(results, project_number, project_name):
+    """Render the project report; returns the PDF bytes and the render time of each page in seconds."""
+    pdf_buffer = io.BytesIO()
+    doc = SimpleDocTemplate(pdf_buffer, pagesize=A4, leftMargin=15*mm, rightMargin=15*mm, topMargin=15*mm, bottomMargin=15*mm)
+    timer = PageTimer()
+    with stage("pdf.build"):
+        doc.build(FlowableStream(build_project_elements(results, project_number, project_name)), onFirstPage=timer, onLaterPages=timer)
+    timer.lap()
+    return pdf_buffer.getvalue(), timer.page_times
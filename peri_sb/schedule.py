@@ -0,0 +1,145 @@
+"""Wall schedule batch mode: chunked CSV reading, vectorized calculation and export."""
+import csv
+import io
+import json
+
+import numpy as np
+
+from .catalog import current_catalog
+from .grid import RESULT_DTYPE, load_error, load_results
+from .interpolators import interpolate_loads
+from .lookup import lookup_loads
+from .loads import FINAL_KEYS, LOAD_KEYS, LoadStatus
+from .optimizer import select_brace_types
+from .validation import validate_bracing_batch
+
+SCHEDULE_COLUMNS = ["id", "brace_type", "height", "pressure", "length"]
+SCHEDULE_RESULT_COLUMNS = SCHEDULE_COLUMNS + LOAD_KEYS + FINAL_KEYS + ["frames", "status", "notes"]
+SCHEDULE_CHUNK_ROWS = 10000
+# Brace type value that asks the optimizer to choose the type
+AUTO_BRACE_TYPE = "auto"
+
+def _parse_floats(values):
+    """Convert a list of strings to a float array; unparsable cells become NaN."""
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        parsed = np.full(len(values), np.nan)
+        for i, value in enumerate(values):
+            try:
+                parsed[i] = float(value)
+            except ValueError:
+                pass
+        return parsed
+
+def read_schedule_chunks(lines, chunk_rows=SCHEDULE_CHUNK_ROWS):
+    """Parse a wall schedule CSV into column chunks of at most chunk_rows rows.
+
+    Header names are matched case-insensitively, with spaces read as underscores.
+    """
+    reader = csv.reader(lines)
+    header = [name.strip().lower().replace(" ", "_") for name in next(reader, [])]
+    missing = [column for column in SCHEDULE_COLUMNS if column not in header]
+    if missing:
+        raise ValueError(f"Wall schedule is missing column(s): {', '.join(missing)}.")
+    indices = [header.index(column) for column in SCHEDULE_COLUMNS]
+
+    rows = []
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        rows.append([row[i].strip() if i < len(row) else "" for i in indices])
+        if len(rows) == chunk_rows:
+            yield _schedule_chunk(rows)
+            rows = []
+    if rows:
+        yield _schedule_chunk(rows)
+
+def _schedule_chunk(rows):
+    ids, brace_types, heights, pressures, lengths = zip(*rows)
+    return {
+        "id": np.array(ids, dtype=object),
+        "brace_type": np.array(brace_types, dtype=object),
+        "height": _parse_floats(heights),
+        "pressure": _parse_floats(pressures),
+        "length": _parse_floats(lengths),
+    }
+
+def compute_schedule(chunk, objective="max_width", interpolation="linear"):
+    """Loads, final values, frame counts and bracing notes for one schedule chunk.
+
+    Rows whose brace type is AUTO_BRACE_TYPE get the best admissible type
+    for the given optimizer objective. interpolation is one of
+    INTERPOLATION_MODES; "linear" is the catalog method of get_loads.
+    """
+    n = len(chunk["id"])
+    loads = np.empty(n, dtype=RESULT_DTYPE)
+    for key in LOAD_KEYS + FINAL_KEYS:
+        loads[key] = np.nan
+    # Rows that are never looked up (no admissible type) stay without loads
+    loads["status"] = LoadStatus.NO_DATA
+    status = np.full(n, "", dtype=object)
+
+    auto = np.array([str(brace_type).lower() == AUTO_BRACE_TYPE for brace_type in chunk["brace_type"]], dtype=bool)
+    if auto.any():
+        chunk = dict(chunk, brace_type=chunk["brace_type"].copy())
+        best = select_brace_types(chunk["height"][auto], chunk["pressure"][auto], objective)["best"]
+        found = np.array([brace_type is not None for brace_type in best], dtype=bool)
+        rows = np.flatnonzero(auto)
+        chunk["brace_type"][rows[found]] = best[found]
+        status[rows[~found]] = "No brace frame type is admissible at this height and pressure."
+
+    grids = current_catalog().grids
+    for brace_type in set(chunk["brace_type"]):
+        mask = (chunk["brace_type"] == brace_type) & (status == "")
+        if brace_type in grids:
+            heights, pressures = chunk["height"][mask], chunk["pressure"][mask]
+            if interpolation == "linear":
+                loads[mask] = load_results(brace_type, heights, pressures, lookup_loads(brace_type, heights, pressures))
+            else:
+                loads[mask] = load_results(brace_type, heights, pressures, interpolate_loads(brace_type, heights, pressures, interpolation))
+        else:
+            loads["status"][mask] = LoadStatus.UNSUPPORTED_TYPE
+            status[mask] = "Brace frame type not supported."
+
+    valid = loads["status"] == LoadStatus.OK
+    notes = np.full(n, "", dtype=object)
+    if valid.any():
+        message_sets, index = validate_bracing_batch(chunk["brace_type"][valid], chunk["height"][valid], loads["e"][valid])
+        notes[valid] = np.array([" | ".join(messages) for messages in message_sets], dtype=object)[index]
+    for i in np.flatnonzero(~valid & (status == "")):
+        status[i] = load_error(chunk["brace_type"][i], chunk["height"][i], chunk["pressure"][i])
+    status[valid] = "OK"
+
+    results = dict(chunk)
+    for key in LOAD_KEYS + FINAL_KEYS:
+        results[key] = loads[key]
+    # Frames at spacing e, including one at each end of the wall
+    results["frames"] = np.ceil(chunk["length"] / loads["e"]) + 1
+    results["status"] = status
+    results["notes"] = notes
+    return results
+
+def concat_schedule(chunks):
+    """Join computed chunks into one set of result columns."""
+    if not chunks:
+        return {column: np.array([]) for column in SCHEDULE_RESULT_COLUMNS}
+    return {column: np.concatenate([chunk[column] for chunk in chunks]) for column in SCHEDULE_RESULT_COLUMNS}
+
+def _export_value(value):
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+def schedule_to_csv(results, columns=SCHEDULE_RESULT_COLUMNS):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    values = [results[column].tolist() for column in columns]
+    writer.writerows(map(_export_value, row) for row in zip(*values))
+    return buffer.getvalue()
+
+def schedule_to_json(results, columns=SCHEDULE_RESULT_COLUMNS):
+    values = [results[column].tolist() for column in columns]
+    records = [dict(zip(columns, map(_export_value, row))) for row in zip(*values)]
+    return json.dumps(records, ensure_ascii=False)
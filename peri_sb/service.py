@@ -0,0 +1,397 @@
+"""Local JSON HTTP service for batch load queries.
+
+Run with ``python -m peri_sb.service``. Endpoints:
+
+- ``POST /loads`` with ``{"queries": [{"brace_type": ..., "height": ..., "pressure": ...}, ...]}``
+  returns ``{"data_version": ..., "results": [...]}`` in query order. Each result holds e, Z,
+  V1, V2, f, the final values at spacing e and the bracing messages, or an ``error``.
+- ``POST /loads`` with columns ``{"brace_type": str or [...], "height": [...], "pressure": [...]}``
+  returns the same values as columns, with ``null`` for points that could not be calculated.
+  Bracing messages are listed once in ``message_sets`` and referenced by index per point.
+  This is the fast path for large batches.
+- ``GET /metrics`` returns request, point and latency counters.
+- ``GET /health`` returns the service status, the default catalog edition and version and the
+  available editions.
+
+Both ``POST /loads`` forms accept an optional ``"edition"`` (one of the editions listed by
+``/health``) to use a catalog edition other than the default; responses carry the ``edition``
+and ``data_version`` they were computed with.
+
+Responses to ``POST /loads`` are encoded with NumPy rather than ``json.dumps``: every value is
+written as digits into a byte matrix, one row per point, and the padding is dropped in one pass.
+
+Connections are kept alive (HTTP/1.1) and nothing outside this process is used.
+"""
+import argparse
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from numpy.lib.recfunctions import structured_to_unstructured
+
+from .catalog import CatalogError, DEFAULT_EDITION, available_editions, current_catalog, use_edition
+from .grid import load_error, load_results
+from .loads import FINAL_KEYS, LOAD_KEYS, LoadStatus
+from .lookup import load_lookup_table, lookup_loads
+from .validation import validate_bracing_batch
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 32 * 1024 * 1024
+# Decimals kept in the JSON output (1 N, 1 mm)
+OUTPUT_DECIMALS = 3
+RESULT_COLUMNS = LOAD_KEYS + FINAL_KEYS
+
+def _digit_table(texts):
+    """Byte matrix of equally long ASCII texts, spaces as NUL."""
+    return np.frombuffer("".join(texts).replace(" ", "\0").encode("ascii"), dtype=np.uint8).reshape(len(texts), -1)
+
+# Three digits of the integer part: rows 0-999 lead (zeros dropped), rows 1000-1999 follow a written digit
+_GROUP_DIGITS = _digit_table([f"{i:3d}" if i else "   " for i in range(1000)] + [f"{i:03d}" for i in range(1000)])
+_UNITS_DIGITS = _digit_table([f"{i:3d}" for i in range(1000)] + [f"{i:03d}" for i in range(1000)])
+# The decimals (OUTPUT_DECIMALS >= 1) with trailing zeros dropped, as Python writes floats: .5, .0
+_FRACTION_DIGITS = _digit_table([
+    f"{i / 10 ** OUTPUT_DECIMALS:.{OUTPUT_DECIMALS}f}"[1:].rstrip("0").ljust(2, "0").ljust(OUTPUT_DECIMALS + 1)
+    for i in range(10 ** OUTPUT_DECIMALS)
+])
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+def _to_floats(values):
+    try:
+        return np.asarray(values, dtype=np.float64).reshape(-1)
+    except (TypeError, ValueError):
+        return np.array([_to_float(value) for value in values])
+
+def _evaluate(brace_types, heights, pressures):
+    """Group points by brace type and look up the loads once per type.
+
+    Returns the rounded RESULT_COLUMNS as one (points, columns) array, NaN where
+    invalid, and the LoadStatus of each point.
+    """
+    n = len(heights)
+    values = np.full((n, len(RESULT_COLUMNS)), np.nan)
+    status = np.full(n, LoadStatus.UNSUPPORTED_TYPE, dtype=np.int8)
+    if isinstance(brace_types, str):
+        groups = {brace_types: slice(None)}
+    else:
+        codes = {}
+        code = np.fromiter((codes.setdefault(brace_type, len(codes)) for brace_type in brace_types), dtype=np.intp, count=n)
+        order = np.argsort(code, kind="stable")
+        bounds = np.searchsorted(code[order], np.arange(len(codes) + 1))
+        groups = {brace_type: order[bounds[k]:bounds[k + 1]] for brace_type, k in codes.items()}
+    grids = current_catalog().grids
+    for brace_type, indices in groups.items():
+        if brace_type not in grids:
+            continue
+        results = load_results(brace_type, heights[indices], pressures[indices], lookup_loads(brace_type, heights[indices], pressures[indices]))
+        values[indices] = structured_to_unstructured(results[RESULT_COLUMNS])
+        status[indices] = results["status"]
+    return np.round(values, OUTPUT_DECIMALS, out=values), status
+
+def _messages(brace_types, heights, values, valid):
+    """Bracing message sets and the index of each valid point's set (NaN where invalid)."""
+    index = np.full(len(heights), np.nan)
+    if not valid.any():
+        return [], index
+    types = brace_types if isinstance(brace_types, str) else np.asarray(brace_types, dtype=object)[valid]
+    message_sets, index[valid] = validate_bracing_batch(types, heights[valid], values[valid, RESULT_COLUMNS.index("e")])
+    return message_sets, index
+
+def _errors(brace_types, heights, pressures, status):
+    """load_error of each point that could not be calculated, None elsewhere.
+
+    Only missing catalog data names the point; other errors are worded once per brace type.
+    """
+    errors = [None] * len(heights)
+    worded = {}
+    status = status.tolist()
+    for i in np.flatnonzero(np.asarray(status) != LoadStatus.OK).tolist():
+        brace_type = brace_types if isinstance(brace_types, str) else brace_types[i]
+        if status[i] == LoadStatus.NO_DATA:
+            errors[i] = load_error(brace_type, float(heights[i]), float(pressures[i]))
+            continue
+        key = (brace_type, status[i])
+        if key not in worded:
+            worded[key] = load_error(brace_type, float(heights[i]), float(pressures[i]))
+        errors[i] = worded[key]
+    return errors
+
+def _parse_queries(queries):
+    fields = [(query.get("brace_type"), query.get("height"), query.get("pressure")) if isinstance(query, dict) else (None, None, None)
+              for query in queries]
+    brace_types, heights, pressures = zip(*fields) if fields else ((), (), ())
+    return list(brace_types), _to_floats(heights), _to_floats(pressures)
+
+def _parse_columns(brace_types, heights, pressures):
+    heights = _to_floats(heights)
+    pressures = _to_floats(pressures)
+    if len(heights) != len(pressures) or (not isinstance(brace_types, str) and len(brace_types) != len(heights)):
+        raise ValueError("brace_type, height and pressure must have the same length.")
+    return brace_types, heights, pressures
+
+def _results(brace_types, heights, pressures):
+    values, status = _evaluate(brace_types, heights, pressures)
+    valid = status == LoadStatus.OK
+    message_sets, message_index = _messages(brace_types, heights, values, valid)
+    return values, valid, message_sets, message_index, _errors(brace_types, heights, pressures, status)
+
+def evaluate_queries(queries):
+    """Loads, final values and bracing messages for a list of query dicts, in order."""
+    values, valid, message_sets, message_index, errors = _results(*_parse_queries(queries))
+    rows = zip(*values.T.tolist(), message_index.tolist())
+    results = []
+    for i, row in enumerate(rows):
+        if valid[i]:
+            result = dict(zip(RESULT_COLUMNS, row))
+            result["messages"] = list(message_sets[int(row[-1])])
+        else:
+            result = {"error": errors[i]}
+        results.append(result)
+    return results
+
+def evaluate_columns(brace_types, heights, pressures):
+    """Columnar form of evaluate_queries; brace_types is one type or a list matching heights."""
+    values, valid, message_sets, message_index, errors = _results(*_parse_columns(brace_types, heights, pressures))
+    payload = {}
+    for k, name in enumerate(RESULT_COLUMNS):
+        column = values[:, k].astype(object)
+        column[~valid] = None
+        payload[name] = column.tolist()
+    payload["messages"] = [None if index != index else int(index) for index in message_index.tolist()]
+    payload["message_sets"] = message_sets
+    payload["error"] = errors
+    return payload
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, allow_nan=False).encode("utf-8")
+
+def _number_bytes(values, integers=False):
+    """JSON numbers (null for NaN), NUL-padded along a new last axis of bytes.
+
+    Floats are written as json.dumps writes them once rounded to OUTPUT_DECIMALS;
+    with integers=True the values are written as integers.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values)
+    scale = 1 if integers else 10 ** OUTPUT_DECIMALS
+    whole, fraction = np.divmod(np.rint(np.abs(np.where(finite, values, 0.0)) * scale).astype(np.int64), scale)
+    groups = max(1, -(-len(str(int(whole.max(initial=0)))) // 3))
+    pieces = [np.where(np.signbit(values), ord("-"), 0).astype(np.uint8)[..., None]]
+    written = np.zeros(values.shape, dtype=np.intp)
+    for g in range(groups):
+        power = 1000 ** (groups - 1 - g)
+        group = whole // power % 1000 if g else whole // power
+        table = _UNITS_DIGITS if g == groups - 1 else _GROUP_DIGITS
+        pieces.append(table.take(group + 1000 * written, axis=0))
+        written = written | (group != 0)
+    if not integers:
+        pieces.append(_FRACTION_DIGITS.take(fraction, axis=0))
+    chars = np.concatenate(pieces, axis=-1)
+    if not finite.all():
+        chars[~finite] = np.frombuffer(b"null".ljust(chars.shape[-1], b"\0"), dtype=np.uint8)
+    return chars
+
+def _join_rows(parts, rows):
+    """Concatenate byte matrices (and byte strings, repeated on every row) row by row."""
+    columns = [np.broadcast_to(np.frombuffer(part, dtype=np.uint8), (rows, len(part))) if isinstance(part, bytes) else part for part in parts]
+    return np.hstack(columns) if columns else np.zeros((rows, 0), dtype=np.uint8)
+
+def _array_bytes(matrix):
+    """JSON array of the rows of a byte matrix."""
+    if not len(matrix):
+        return b"[]"
+    chars = _join_rows([matrix, b","], len(matrix))
+    return b"[" + chars[chars != 0].tobytes()[:-1] + b"]"
+
+def _object_bytes(fields):
+    """JSON object of (name, value) pairs; bytes values are already encoded."""
+    return b"{" + b",".join(_dumps(name) + b":" + (value if isinstance(value, bytes) else _dumps(value)) for name, value in fields) + b"}"
+
+def _queries_json(queries):
+    """evaluate_queries encoded as a JSON array."""
+    values, valid, message_sets, message_index, errors = _results(*_parse_queries(queries))
+    n = len(valid)
+    numbers = _number_bytes(values)
+    parts = []
+    for k, name in enumerate(RESULT_COLUMNS):
+        parts += [(b"," if parts else b"{") + _dumps(name) + b":", numbers[:, k]]
+    # Numbers never contain a newline, so it separates the rows
+    chars = _join_rows(parts + [b',"messages":\n'], n)
+    loads = chars[chars != 0].tobytes().split(b"\n")
+    sets = [_dumps(list(messages)) + b"}" for messages in message_sets]
+    failed = {error: b'{"error":' + _dumps(error) + b"}" for error in set(errors)}
+    index = np.where(valid, message_index, 0).astype(np.intp).tolist()
+    rows = [head + sets[k] if ok else failed[error] for head, k, ok, error in zip(loads, index, valid.tolist(), errors)]
+    return b"[" + b",".join(rows) + b"]"
+
+def _columns_fields(brace_types, heights, pressures):
+    """evaluate_columns encoded as the fields of a JSON object, (name, bytes) pairs in order."""
+    values, valid, message_sets, message_index, errors = _results(*_parse_columns(brace_types, heights, pressures))
+    numbers = _number_bytes(values)
+    fields = [(name, _array_bytes(numbers[:, k])) for k, name in enumerate(RESULT_COLUMNS)]
+    fields.append(("messages", _array_bytes(_number_bytes(message_index, integers=True))))
+    fields.append(("message_sets", _dumps(message_sets)))
+    encoded = {error: _dumps(error) for error in set(errors)}
+    fields.append(("error", b"[" + b",".join([encoded[error] for error in errors]) + b"]"))
+    return fields
+
+class ServiceMetrics:
+    """Request, point and latency counters shared by all handler threads.
+
+    Latency percentiles are taken over the last `window` requests; the request
+    rate counts every request of the last `rate_period` seconds in a ring of
+    one-second buckets, so it does not saturate under load.
+    """
+    def __init__(self, window=2048, rate_period=60):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.rate_period = int(rate_period)
+        # Request count and the second it belongs to, per slot of the ring
+        self._rate_counts = [0] * self.rate_period
+        self._rate_seconds = [-1] * self.rate_period
+        self.started = time.monotonic()
+        self.requests = 0
+        self.points = 0
+        self.errors = 0
+
+    def record(self, latency, points=0, error=False):
+        now = time.monotonic()
+        with self._lock:
+            self.requests += 1
+            self.points += points
+            self.errors += int(error)
+            self._latencies.append(latency)
+            second = int(now)
+            slot = second % self.rate_period
+            if self._rate_seconds[slot] != second:
+                self._rate_seconds[slot], self._rate_counts[slot] = second, 0
+            self._rate_counts[slot] += 1
+
+    def snapshot(self):
+        now = time.monotonic()
+        with self._lock:
+            latencies = sorted(self._latencies)
+            second = int(now)
+            recent = sum(count for count, bucket in zip(self._rate_counts, self._rate_seconds) if second - bucket < self.rate_period)
+            uptime = now - self.started
+            snapshot = {
+                "uptime_s": round(uptime, 3),
+                "requests": self.requests,
+                "points": self.points,
+                "errors": self.errors,
+            }
+        snapshot["requests_per_s"] = round(recent / max(min(uptime, self.rate_period), 1e-9), 3)
+        if latencies:
+            snapshot["latency_ms"] = {
+                "p50": round(1000 * latencies[len(latencies) // 2], 3),
+                "p95": round(1000 * latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)], 3),
+                "max": round(1000 * latencies[-1], 3),
+            }
+        return snapshot
+
+class LoadRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "PERI-SB/1.0"
+
+    def do_GET(self):
+        start = time.perf_counter()
+        if self.path == "/health":
+            catalog = current_catalog()
+            status, payload = 200, {"status": "ok", "edition": catalog.edition, "data_version": catalog.version, "editions": available_editions()}
+        elif self.path == "/metrics":
+            status, payload = 200, self.server.metrics.snapshot()
+        else:
+            status, payload = 404, {"error": f"Unknown path {self.path}."}
+        self._send_json(status, payload)
+        self.server.metrics.record(time.perf_counter() - start, error=status != 200)
+
+    def do_POST(self):
+        start = time.perf_counter()
+        points = 0
+        status, payload = 200, None
+        if self.path != "/loads":
+            status, payload = 404, {"error": f"Unknown path {self.path}."}
+        else:
+            length = self.headers.get("Content-Length") or "0"
+            if not length.isdecimal():
+                # A body of unknown size cannot be skipped; the connection is not reused
+                status, payload = 400, {"error": "Content-Length must be a non-negative integer."}
+                self.close_connection = True
+            elif int(length) > MAX_BODY_BYTES:
+                status, payload = 413, {"error": "Request body too large."}
+                self.close_connection = True
+            else:
+                length = int(length)
+                try:
+                    payload, points = self._evaluate_body(json.loads(self.rfile.read(length)))
+                except CatalogError as exc:
+                    status, payload = 400, {"error": str(exc)}
+                except (ValueError, KeyError, TypeError):
+                    status, payload = 400, {"error": 'Expected a JSON body of the form {"queries": [...]} or {"brace_type": ..., "height": [...], "pressure": [...]}.'}
+        self._send_json(status, payload)
+        self.server.metrics.record(time.perf_counter() - start, points, error=status != 200)
+
+    @staticmethod
+    def _evaluate_body(body):
+        if not isinstance(body, dict):
+            raise TypeError
+        edition = body.get("edition") or DEFAULT_EDITION
+        # The edition names a file; only editions that exist are accepted
+        if edition not in available_editions():
+            raise CatalogError(f"Unknown catalog edition {edition!r}; see /health for the available editions.")
+        with use_edition(edition) as catalog:
+            header = [("edition", catalog.edition), ("data_version", catalog.version)]
+            if "queries" in body:
+                if not isinstance(body["queries"], list):
+                    raise TypeError
+                return _object_bytes(header + [("results", _queries_json(body["queries"]))]), len(body["queries"])
+            fields = _columns_fields(body["brace_type"], body["height"], body["pressure"])
+            return _object_bytes(header + fields), len(body["height"])
+
+    def _send_json(self, status, payload):
+        """Send payload, a JSON-serializable value or an already encoded body."""
+        body = payload if isinstance(payload, bytes) else _dumps(payload)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+class LoadService(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=(DEFAULT_HOST, DEFAULT_PORT), verbose=False):
+        super().__init__(address, LoadRequestHandler)
+        self.metrics = ServiceMetrics()
+        self.verbose = verbose
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local JSON HTTP service for PERI brace frame load queries.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--verbose", action="store_true", help="log every request to stderr")
+    args = parser.parse_args(argv)
+
+    load_lookup_table()
+    with LoadService((args.host, args.port), verbose=args.verbose) as server:
+        catalog = current_catalog()
+        print(f"Serving brace frame loads on http://{args.host}:{server.server_address[1]} (catalog {catalog.edition}, {catalog.version})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Per-rerun stage timing.
+
+Code marks its stages with ``with stage("name"):``. Nothing is measured unless
+a StageTimer is active in the current context; otherwise stage() returns a
+shared no-op context manager, so instrumented hot paths cost one ContextVar
+lookup. The app keeps one StageTimer per session, activates it for the length
+of each rerun and writes the finished record as one JSON log line.
+
+Background jobs time their run with a StageTimer of their own; the rerun that
+fetches a job's result adds the job's render time and stages to its record
+(add_record), so those stages are not part of the rerun's total_ms.
+"""
+import contextlib
+import json
+import logging
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+TIMING_LOGGER = "peri_sb.timing"
+TIMING_HISTORY = 100
+
+_active_timer = ContextVar("peri_sb_stage_timer", default=None)
+_no_timing = contextlib.nullcontext()
+
+def stage(name):
+    """Time the enclosed block as `name` if a StageTimer is active."""
+    timer = _active_timer.get()
+    return _no_timing if timer is None else timer.stage(name)
+
+def add_record(name, record):
+    """Add a record finished elsewhere to the active StageTimer's rerun, if any; see StageTimer.add."""
+    timer = _active_timer.get()
+    if timer is not None:
+        timer.add(name, record)
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+class StageTimer:
+    """Stage durations of the current rerun and a rolling history of finished reruns.
+
+    Durations of a stage entered several times in one rerun are summed.
+    """
+    def __init__(self, history=TIMING_HISTORY):
+        self.session = uuid.uuid4().hex[:12]
+        self.reruns = 0
+        self.history = deque(maxlen=history)
+        self._stages = {}
+        self._start = None
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stages[name] = self._stages.get(name, 0.0) + time.perf_counter() - start
+
+    def add(self, name, record):
+        """Add a record finished elsewhere, e.g. by a background job, to the current rerun.
+
+        Its total is added as stage `name` and its stages under their own names.
+        """
+        for stage_name, ms in [(name, record["total_ms"]), *record["stages_ms"].items()]:
+            self._stages[stage_name] = self._stages.get(stage_name, 0.0) + ms / 1000
+
+    def start(self):
+        """Begin a rerun and make this the active timer; returns the token for finish()."""
+        self._stages = {}
+        self._start = time.perf_counter()
+        return _active_timer.set(self)
+
+    def finish(self, token, **fields):
+        """End the rerun, store it in the history and return its record.
+
+        Extra keyword fields (e.g. the page) are added to the record.
+        """
+        total = time.perf_counter() - self._start
+        _active_timer.reset(token)
+        self.reruns += 1
+        record = {
+            "event": "rerun",
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "session": self.session,
+            "rerun": self.reruns,
+            **fields,
+            "total_ms": round(1000 * total, 3),
+            "stages_ms": {name: round(1000 * seconds, 3) for name, seconds in self._stages.items()},
+        }
+        self.history.append(record)
+        return record
+
+    def summary(self):
+        """Latest, p50 and p95 in ms per stage over the history, total first."""
+        if not self.history:
+            return {}
+        latest = self.history[-1]
+        samples = {"total": [record["total_ms"] for record in self.history]}
+        for record in self.history:
+            for name, ms in record["stages_ms"].items():
+                samples.setdefault(name, []).append(ms)
+        return {
+            name: {
+                "latest": latest["total_ms"] if name == "total" else latest["stages_ms"].get(name),
+                "p50": _percentile(values, 0.5),
+                "p95": _percentile(values, 0.95),
+                "count": len(values),
+            }
+            for name, values in samples.items()
+        }
+
+def timing_logger():
+    """Logger for the per-rerun JSON lines; writes to stderr unless configured elsewhere."""
+    logger = logging.getLogger(TIMING_LOGGER)
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+def log_rerun(record):
+    timing_logger().info(json.dumps(record, ensure_ascii=False))
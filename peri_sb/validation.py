@@ -0,0 +1,186 @@
+"""Diagonal bracing requirements per brace frame type.
+
+The requirements are data: RULES lists, in message order, the brace types a
+rule applies to (names or fnmatch patterns), its condition on the height and
+the permissible width of influence e, its severity and its message. A
+condition is None (always), a comparison (field, operator, value),
+("all" | "any", [conditions]) or ("not", condition).
+
+Each condition is compiled once into a predicate(height, e): closures over the
+comparisons of the operator module, combined with the element-wise operators
+&, | and ^, so the same predicate runs on scalars and on arrays.
+validate_bracing runs the predicates of one type, collected on first use of
+the type, and validate_bracing_batch validates a whole schedule with one array
+evaluation per rule.
+"""
+import fnmatch
+import functools
+import operator
+
+SEVERITIES = ["info", "recommendation", "required", "warning"]
+
+CRANE_BRACING = "Required: Diagonal Bracing for moving and lifting the formwork unit with the crane."
+NO_CONCRETING_BRACING = "No diagonal bracing required for concreting."
+MAX_WIDTH_WARNING = "Warning: Permissible width of influence exceeds maximum of 1.25 m."
+
+SB_A_B_OMIT = ("all", [("e", "<=", 1.35), ("height", "<=", 5.25)])
+SB_B_C_OMIT = ("all", [("e", "<=", 1.35), ("height", "<=", 4.25)])
+SB_B_REQUIRED = ("all", [("e", ">", 1.35), ("height", ">=", 3.75)])
+SB_2_REQUIRED = ("height", ">=", 5.00)
+MAX_WIDTH_EXCEEDED = ("e", ">", 1.25)
+
+# (brace types, condition, severity, message); messages of a type come out in this order
+RULES = [
+    (["SB-*"], None, "recommendation", "Recommendation: Pre-incline the Brace Frame by 2/3 of the calculated deflection."),
+
+    (["SB-A+B"], SB_A_B_OMIT, "info", "Diagonal Bracing B can be omitted during concreting."),
+    (["SB-A+B"], ("not", SB_A_B_OMIT), "required", "Required: Diagonal Bracing A and B for concreting."),
+    (["SB-A+B"], None, "required", "Required: Diagonal Bracing for moving and lifting the formwork unit with the crane."),
+
+    (["SB-A0+A+B+C"], None, "required", "Required: Diagonal Bracing A, B, and C for concreting, horizontally moving, and lifting the formwork unit with the crane."),
+
+    (["SB-A+B+C"], None, "required", "Required: Diagonal Bracing A, B, and C for concreting."),
+    (["SB-A+B+C"], None, "required", "Required: Diagonal Bracing for horizontally moving and lifting the formwork unit with the crane."),
+
+    (["SB-B+C"], SB_B_C_OMIT, "info", "Diagonal Bracing B can be omitted during concreting."),
+    (["SB-B+C"], ("not", SB_B_C_OMIT), "required", "Required: Diagonal Bracing B and C for concreting."),
+    (["SB-B+C"], None, "required", "Required: Diagonal Bracing B or D for lifting with the crane."),
+
+    (["SB-A+C", "SB-A"], None, "info", NO_CONCRETING_BRACING),
+    (["SB-A+C", "SB-A"], None, "required", "Required: Diagonal Bracing C for moving and lifting the formwork unit with the crane."),
+
+    (["SB-B"], SB_B_REQUIRED, "required", "Required: Diagonal Bracing B for concreting."),
+    (["SB-B"], ("not", SB_B_REQUIRED), "info", "No diagonal bracing required for concreting until height reaches 3.75 m if e ≤ 1.35 m."),
+    (["SB-B"], None, "required", CRANE_BRACING),
+
+    (["SB-1"], None, "info", NO_CONCRETING_BRACING),
+    (["SB-1"], None, "required", CRANE_BRACING),
+    (["SB-1"], MAX_WIDTH_EXCEEDED, "warning", MAX_WIDTH_WARNING),
+
+    (["SB-2"], SB_2_REQUIRED, "required", "Required: Diagonal Bracing for concreting (height ≥ 5.00 m)."),
+    (["SB-2"], ("not", SB_2_REQUIRED), "info", "No diagonal bracing required for concreting (height < 5.00 m)."),
+    (["SB-2"], None, "required", CRANE_BRACING),
+    (["SB-2"], MAX_WIDTH_EXCEEDED, "warning", MAX_WIDTH_WARNING),
+]
+
+_OPERATORS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+_FIELDS = ["height", "e"]
+
+def _all(first, second):
+    return lambda height, e: first(height, e) & second(height, e)
+
+def _any(first, second):
+    return lambda height, e: first(height, e) | second(height, e)
+
+def _predicate(condition):
+    kind = condition[0]
+    if kind in ("all", "any"):
+        if not condition[1]:
+            raise ValueError(f"Invalid rule condition {condition!r}.")
+        combine = _all if kind == "all" else _any
+        return functools.reduce(combine, [_predicate(part) for part in condition[1]])
+    if kind == "not":
+        negated = _predicate(condition[1])
+        # xor with True negates a bool and a bool array alike; ~ would turn True into -2
+        return lambda height, e: negated(height, e) ^ True
+    if len(condition) != 3:
+        raise ValueError(f"Invalid rule condition {condition!r}.")
+    field, op, value = condition
+    if field not in _FIELDS or op not in _OPERATORS or not isinstance(value, (int, float)):
+        raise ValueError(f"Invalid rule condition {condition!r}.")
+    compare, value = _OPERATORS[op], float(value)
+    if field == "height":
+        return lambda height, e: compare(height, value)
+    return lambda height, e: compare(e, value)
+
+def compile_condition(condition):
+    """Predicate(height, e) for a rule condition, or None if the rule always applies."""
+    if condition is None:
+        return None
+    return _predicate(condition)
+
+def compile_rules(rules):
+    """Rules as (brace type patterns, predicate or None, severity, message) with the conditions compiled."""
+    compiled = []
+    for brace_types, condition, severity, message in rules:
+        if severity not in SEVERITIES:
+            raise ValueError(f"Unknown severity {severity!r}; expected one of {', '.join(SEVERITIES)}.")
+        compiled.append((tuple(brace_types), compile_condition(condition), severity, message))
+    return compiled
+
+COMPILED_RULES = compile_rules(RULES)
+
+@functools.lru_cache(maxsize=256)
+def rules_for_type(brace_type):
+    """Indices into COMPILED_RULES of the rules that apply to a brace type, in message order."""
+    return tuple(r for r, (patterns, _, _, _) in enumerate(COMPILED_RULES)
+                 if any(fnmatch.fnmatchcase(brace_type, pattern) for pattern in patterns))
+
+@functools.lru_cache(maxsize=256)
+def compile_validator(brace_type):
+    """validate_bracing for one brace type over the predicates of its rules."""
+    rules = [(COMPILED_RULES[r][1], COMPILED_RULES[r][3]) for r in rules_for_type(brace_type)]
+
+    def validate(height, e):
+        messages = []
+        for predicate, message in rules:
+            if predicate is None or predicate(height, e):
+                messages.append(message)
+        return messages
+    return validate
+
+def validate_bracing(brace_type, height, e):
+    """Validate diagonal bracing requirements based on document notes."""
+    return compile_validator(brace_type)(height, e)
+
+def bracing_rule_mask(brace_types, heights, e):
+    """Boolean array (rules, *points): which of RULES applies at each point.
+
+    brace_types, heights and e broadcast against each other; brace_types may
+    be a single type.
+    """
+    # Imported here so the scalar validate_bracing path does not load NumPy
+    import numpy as np
+
+    brace_types, heights, e = np.broadcast_arrays(np.asarray(brace_types, dtype=object), np.asarray(heights, dtype=np.float64), np.asarray(e, dtype=np.float64))
+    # Number the distinct types; a dict is much faster than sorting the object array
+    numbers = {}
+    type_index = np.fromiter((numbers.setdefault(name, len(numbers)) for name in brace_types.ravel().tolist()),
+                             dtype=np.intp, count=brace_types.size).reshape(brace_types.shape)
+    applies = np.zeros((len(COMPILED_RULES), len(numbers)), dtype=bool)
+    for name, t in numbers.items():
+        applies[list(rules_for_type(name)), t] = True
+    mask = applies[:, type_index]
+    for r, (_, predicate, _, _) in enumerate(COMPILED_RULES):
+        if predicate is not None and applies[r].any():
+            mask[r] &= predicate(heights, e)
+    return mask
+
+def validate_bracing_batch(brace_types, heights, e):
+    """validate_bracing for arrays of points, as distinct message lists and an index per point.
+
+    Returns (message_sets, index): message_sets[index[i]] is the message list
+    of point i; the lists are numbered in order of first appearance. Inputs
+    broadcast as in bracing_rule_mask.
+    """
+    import numpy as np
+
+    mask = bracing_rule_mask(brace_types, heights, e)
+    codes = np.zeros(mask.shape[1:], dtype=np.int64)
+    for r in range(len(COMPILED_RULES)):
+        codes |= mask[r].astype(np.int64) << r
+    unique_codes, first, index = np.unique(codes.ravel(), return_index=True, return_inverse=True)
+    # Number the sets in order of first appearance
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    message_sets = [[message for r, (_, _, _, message) in enumerate(COMPILED_RULES) if code >> r & 1] for code in unique_codes[order].tolist()]
+    return message_sets, rank[index].reshape(codes.shape)
+
+def bracing_warnings(brace_types, heights, e):
+    """Boolean array: True where any warning rule applies."""
+    import numpy as np
+
+    mask = bracing_rule_mask(brace_types, heights, e)
+    warnings = [r for r, rule in enumerate(COMPILED_RULES) if rule[2] == "warning"]
+    return mask[warnings].any(axis=0) if warnings else np.zeros(mask.shape[1:], dtype=bool)